@@ -1,17 +1,31 @@
 """AI-powered commit message generation for codeup."""
 
+import hashlib
 import logging
 import os
 import re
 
-import openai
-
-from codeup.git_utils import get_git_diff, get_git_diff_cached, safe_git_commit
+from codeup.git_utils import (
+    get_git_diff,
+    get_git_diff_cached,
+    interrupt_main,
+    safe_git_commit,
+)
 
 logger = logging.getLogger(__name__)
 
 CommitProvider = str | None
 
+# Diffs with fewer changed lines than this (file headers excluded) get a canned
+# message instead of an API round trip (whitespace-only edits, binary blobs, etc.).
+# Any real one-line edit still goes to the AI providers.
+_MIN_MEANINGFUL_DIFF_LINES = 1
+_TRIVIAL_DIFF_COMMIT_MESSAGE = "chore: minor updates"
+
+# Generated commit messages keyed by the sha1 of the diff they describe, so
+# repeated runs over an unchanged diff reuse the previous response.
+_DIFF_HASH_CACHE: dict[str, str] = {}
+
 
 class AuthException(Exception):
     """Raised when API authentication fails due to missing or invalid keys."""
@@ -192,8 +206,6 @@ def _generate_cli_commit_message(
 
     except KeyboardInterrupt:
         logger.info("_generate_cli_commit_message interrupted by user")
-        from codeup.git_utils import interrupt_main
-
         interrupt_main()
         raise
     except subprocess.TimeoutExpired:
@@ -277,8 +289,6 @@ Respond with only the commit message, nothing else."""
         return AuthException("Anthropic library not installed", provider="anthropic")
     except KeyboardInterrupt:
         logger.info("_generate_ai_commit_message_anthropic interrupted by user")
-        from codeup.git_utils import interrupt_main
-
         interrupt_main()
         raise
     except Exception as e:
@@ -309,6 +319,25 @@ def _get_commit_diff_text() -> str | AuthException:
     return diff_text
 
 
+def _count_meaningful_diff_lines(diff_text: str) -> int:
+    """Count added/removed diff lines that carry more than a bare +/- marker.
+
+    The ``---``/``+++`` file headers are not changes and are skipped.
+    """
+    return sum(
+        1
+        for line in diff_text.splitlines()
+        if line.startswith(("+", "-"))
+        and not line.startswith(("+++", "---"))
+        and line.strip() not in ("+", "-")
+    )
+
+
+def _diff_cache_key(diff_text: str) -> str:
+    """Return the cache key used for a diff in _DIFF_HASH_CACHE."""
+    return hashlib.sha1(diff_text.encode("utf-8", "replace")).hexdigest()
+
+
 def _generate_ai_commit_message(
     provider: CommitProvider = None,
 ) -> str | AuthException | Exception:
@@ -337,6 +366,16 @@ def _generate_ai_commit_message(
                 f"Check that 'clud' is installed and the {provider} backend is available."
             )
 
+        if _count_meaningful_diff_lines(diff_text) < _MIN_MEANINGFUL_DIFF_LINES:
+            logger.info("Diff has no meaningful line changes, skipping AI providers")
+            return _TRIVIAL_DIFF_COMMIT_MESSAGE
+
+        cache_key = _diff_cache_key(diff_text)
+        cached_message = _DIFF_HASH_CACHE.get(cache_key)
+        if cached_message is not None:
+            logger.info("Reusing cached commit message for identical diff")
+            return cached_message
+
         # Import and use existing OpenAI config system
         from codeup.config import get_openai_api_key
 
@@ -352,7 +391,9 @@ def _generate_ai_commit_message(
                 os.environ["OPENAI_BASE_URL"] = "https://api.openai.com/v1"
                 os.environ["OPENAI_API_BASE"] = "https://api.openai.com/v1"
 
-                # Create OpenAI client
+                # Create OpenAI client (imported lazily; it pulls in httpx/pydantic)
+                import openai
+
                 client = openai.OpenAI(api_key=api_key)
 
                 prompt = f"""You are an expert developer who writes clear, concise commit messages following conventional commit format.
@@ -384,14 +425,14 @@ Respond with only the commit message, nothing else."""
                     logger.info(
                         f"Successfully generated OpenAI commit message: {commit_message[:50]}..."
                     )
+                    if commit_message:
+                        _DIFF_HASH_CACHE[cache_key] = commit_message
                     return commit_message
                 else:
                     logger.warning("OpenAI API returned empty response")
 
             except KeyboardInterrupt:
                 logger.info("OpenAI API call interrupted by user")
-                from codeup.git_utils import interrupt_main
-
                 interrupt_main()
                 raise
             except Exception as e:
@@ -446,6 +487,7 @@ Respond with only the commit message, nothing else."""
 
         if isinstance(anthropic_result, str):
             # Success - return the commit message
+            _DIFF_HASH_CACHE[cache_key] = anthropic_result
             return anthropic_result
         elif isinstance(anthropic_result, AuthException):
             anthropic_auth_error = anthropic_result
@@ -457,6 +499,7 @@ Respond with only the commit message, nothing else."""
         # Both API providers failed - try clud as last-resort fallback
         clud_result = _generate_ai_commit_message_clud(diff_text)
         if isinstance(clud_result, str):
+            _DIFF_HASH_CACHE[cache_key] = clud_result
             return clud_result
 
         # All providers failed - determine if it's an auth issue
@@ -478,8 +521,6 @@ Respond with only the commit message, nothing else."""
 
     except KeyboardInterrupt:
         logger.info("_generate_ai_commit_message interrupted by user")
-        from codeup.git_utils import interrupt_main
-
         interrupt_main()
         raise
     except Exception as e:
@@ -585,8 +626,6 @@ def _opencommit_or_prompt_for_commit_message(
         msg = input_with_timeout("Commit message: ")
         safe_git_commit(msg)
     except KeyboardInterrupt:
-        from codeup.git_utils import interrupt_main
-
         interrupt_main()
         raise
     except Exception as e:
@@ -28,6 +28,7 @@ class Args:
     lint: bool
     test: bool
     pre_test: bool
+    fetch_max_age: float = 60.0
 
     def __post_init__(self) -> None:
         assert isinstance(
@@ -86,6 +87,9 @@ class Args:
         assert isinstance(
             self.pre_test, bool
         ), f"Expected bool, got {type(self.pre_test)}"
+        assert isinstance(
+            self.fetch_max_age, float | int
+        ), f"Expected float, got {type(self.fetch_max_age)}"
 
     @staticmethod
     def parse_args() -> "Args":
@@ -93,8 +97,11 @@ class Args:
         return _parse_args()
 
 
-def _parse_args() -> Args:
-    """Parse command-line arguments."""
+def _parse_args(argv: list[str] | None = None) -> Args:
+    """Parse command-line arguments.
+
+    ``argv`` excludes the program name and defaults to ``sys.argv[1:]``.
+    """
     parser = argparse.ArgumentParser()
     parser.add_argument("repo", help="Path to the repo to summarize", nargs="?")
     parser.add_argument(
@@ -193,7 +200,13 @@ def _parse_args() -> Args:
         help="Error if there are untracked files (prevents blocking when run as subcommand)",
         action="store_true",
     )
-    tmp = parser.parse_args()
+    parser.add_argument(
+        "--fetch-max-age",
+        type=float,
+        default=60.0,
+        help="Skip 'git fetch' if the last fetch is younger than this many seconds (0 to always fetch)",
+    )
+    tmp = parser.parse_args(argv)
 
     out: Args = Args(
         repo=tmp.repo,
@@ -218,6 +231,7 @@ def _parse_args() -> Args:
         lint=tmp.lint,
         test=tmp.test,
         pre_test=tmp.pre_test,
+        fetch_max_age=tmp.fetch_max_age,
     )
     return out
 
@@ -6,9 +6,13 @@ import sys
 
 from running_process import RunningProcess
 from running_process.compat import PIPE
-from running_process.output_formatter import NullOutputFormatter
 
-from codeup.git_utils import LintResult, TestResult, interrupt_main
+from codeup.git_utils import (
+    _NULL_FORMATTER,
+    LintResult,
+    TestResult,
+    interrupt_main,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -36,17 +40,26 @@ def run_command_with_callback(
     stderr_lines = []
     stopped_early = False
 
-    from codeup.utils import get_next_process_output, get_process_output_iterator
+    from codeup.utils import (
+        BatchedLineWriter,
+        get_next_process_output,
+        get_process_output_iterator,
+        is_interrupted,
+        process_is_running,
+        write_output_line,
+    )
 
     rp = RunningProcess(
         command=cmd,
         shell=shell,
         auto_run=True,
         check=False,
-        output_formatter=NullOutputFormatter(),
+        output_formatter=_NULL_FORMATTER,
         stderr=PIPE,
     )
     output_iterator = get_process_output_iterator(rp, timeout=1.0)
+    stdout_writer = BatchedLineWriter(sys.stdout)
+    stderr_writer = BatchedLineWriter(sys.stderr)
 
     try:
         while True:
@@ -57,8 +70,8 @@ def run_command_with_callback(
                     timeout=1.0,
                 )
             except TimeoutError as err:
-                from codeup.utils import is_interrupted, process_is_running
-
+                stdout_writer.flush()
+                stderr_writer.flush()
                 if is_interrupted():
                     rp.kill()
                     raise KeyboardInterrupt("Process interrupted") from err
@@ -75,10 +88,7 @@ def run_command_with_callback(
                 else:
                     stdout_lines.append(line)
 
-                output_stream = sys.stderr if stream_name == "stderr" else sys.stdout
-                print(line, file=output_stream, flush=True)
-
-                from codeup.utils import is_interrupted
+                write_output_line(stream_name, line, stdout_writer, stderr_writer)
 
                 if is_interrupted():
                     rp.kill()
@@ -114,6 +124,9 @@ def run_command_with_callback(
     except Exception as e:
         logger.warning(f"Exception during line iteration: {e}")
         rp.kill()
+    finally:
+        stdout_writer.flush()
+        stderr_writer.flush()
 
     rp.wait()
     stdout_text = "\n".join(stdout_lines)
@@ -5,6 +5,9 @@ import logging
 import os
 import shutil
 import sys
+import threading
+import time
+import traceback
 from dataclasses import dataclass
 from pathlib import Path
 
@@ -14,28 +17,50 @@ from running_process.output_formatter import NullOutputFormatter
 
 logger = logging.getLogger(__name__)
 
+# NullOutputFormatter keeps no state, so every command can share this one
+_NULL_FORMATTER = NullOutputFormatter()
+
+# Absolute path to git, resolved once at startup by check_environment(). When
+# set, git commands are spawned by path instead of searching PATH every time.
+_git_executable: str | None = None
+
+
+def set_git_executable(path: str | None) -> None:
+    """Record the resolved git executable used by _run_git_command."""
+    global _git_executable
+    _git_executable = path
+
 
 def _run_git_command(
     cmd: list[str],
     quiet: bool = False,
     capture_output: bool = True,
     cwd: str | None = None,
+    env: dict[str, str] | None = None,
 ) -> tuple[int, str, str]:
     """Run a git command using RunningProcess and return (exit_code, stdout, stderr)."""
     stdout_lines = []
     stderr_lines = []
 
+    if _git_executable and cmd and cmd[0] == "git":
+        cmd = [_git_executable, *cmd[1:]]
+
     rp = RunningProcess(
         command=cmd,
         cwd=Path(cwd) if cwd else None,
         auto_run=True,
         check=False,
-        output_formatter=NullOutputFormatter(),
+        output_formatter=_NULL_FORMATTER,
+        env=env,
         stderr=PIPE,
     )
 
     try:
-        from codeup.utils import get_next_process_output, get_process_output_iterator
+        from codeup.utils import (
+            get_next_process_output,
+            get_process_output_iterator,
+            is_interrupted,
+        )
 
         output_iterator = get_process_output_iterator(rp, timeout=600.0)
 
@@ -61,8 +86,6 @@ def _run_git_command(
                     print(line, file=output_stream, flush=True)
 
                 # Check if process was interrupted by Ctrl+C
-                from codeup.utils import is_interrupted
-
                 if is_interrupted():
                     rp.kill()
                     raise KeyboardInterrupt("Process interrupted")
@@ -71,8 +94,6 @@ def _run_git_command(
         rp.kill()
         raise
     except TimeoutError as e:
-        import traceback
-
         logger.error(f"Timeout waiting for git command output: {e}")
         logger.error(f"Git command that timed out: {cmd}")
         logger.error("Stack trace of timeout location:")
@@ -85,6 +106,8 @@ def _run_git_command(
         rp.kill()  # Kill the process on timeout or other exceptions
 
     rp.wait()
+    if len(cmd) > 1 and cmd[1] in _BRANCH_SWITCHING_SUBCOMMANDS:
+        clear_branch_cache()
     stdout_text = "\n".join(stdout_lines) if capture_output else ""
     stderr_text = "\n".join(stderr_lines) if capture_output else ""
     return rp.returncode or 0, stdout_text, stderr_text
@@ -290,8 +313,33 @@ def get_untracked_files() -> list[str]:
         return []
 
 
+# Branch names resolved during this run, keyed by (kind, repo directory).
+# Each is looked up at most once per repository per run. The cache is cleared
+# when a run starts and after any git command that can switch branches.
+_BRANCH_CACHE: dict[tuple[str, str], str] = {}
+_BRANCH_SWITCHING_SUBCOMMANDS = frozenset({"checkout", "switch", "rebase"})
+
+
+def clear_branch_cache() -> None:
+    """Forget cached branch names so the next lookup asks git again."""
+    _BRANCH_CACHE.clear()
+
+
 def get_main_branch() -> str:
     """Get the main branch name (main, master, etc.)."""
+    key = ("main", os.getcwd())
+    cached = _BRANCH_CACHE.get(key)
+    if cached:
+        return cached
+    branch = _resolve_main_branch()
+    if branch is None:
+        return "main"  # Default fallback, not cached so a later fetch can fix it
+    _BRANCH_CACHE[key] = branch
+    return branch
+
+
+def _resolve_main_branch() -> str | None:
+    """Ask git for origin's default branch, or None if it can't be determined."""
     try:
         # Try to get the default branch from remote
         exit_code, stdout, stderr = _run_git_command(
@@ -325,11 +373,15 @@ def get_main_branch() -> str:
             logger.error(f"Error checking branch {branch}: {e}")
             continue
 
-    return "main"  # Default fallback
+    return None
 
 
 def get_current_branch() -> str:
     """Get the current branch name."""
+    key = ("current", os.getcwd())
+    cached = _BRANCH_CACHE.get(key)
+    if cached:
+        return cached
     try:
         from codeup.console import dim
 
@@ -338,7 +390,10 @@ def get_current_branch() -> str:
             ["git", "branch", "--show-current"],
             quiet=False,  # Enable streaming to see what's happening
         )
-        return stdout.strip()
+        branch = stdout.strip()
+        if exit_code == 0 and branch:
+            _BRANCH_CACHE[key] = branch
+        return branch
     except KeyboardInterrupt:
         logger.info("get_current_branch interrupted by user")
         interrupt_main()
@@ -417,9 +472,21 @@ def get_merge_base(target_branch: str) -> str:
 def check_rebase_needed(target_branch: str) -> bool:
     """Check if current branch is behind the remote target branch."""
     try:
-        remote_hash = get_remote_branch_hash(target_branch)
-        merge_base = get_merge_base(target_branch)
-        return merge_base != remote_hash
+        # Handle both origin/branch format and just branch format
+        remote_ref = (
+            target_branch
+            if target_branch.startswith("origin/")
+            else f"origin/{target_branch}"
+        )
+        # One git call instead of rev-parse + merge-base: exit 0 means the
+        # remote tip is already in HEAD's history, 1 means it is not.
+        exit_code, _, stderr = _run_git_command(
+            ["git", "merge-base", "--is-ancestor", remote_ref, "HEAD"],
+            quiet=True,
+        )
+        if exit_code not in (0, 1):
+            logger.warning(f"git merge-base --is-ancestor failed: {stderr.strip()}")
+        return exit_code != 0
     except KeyboardInterrupt:
         logger.info("check_rebase_needed interrupted by user")
         interrupt_main()
@@ -668,6 +735,36 @@ def has_modified_tracked_files() -> bool:
         return False
 
 
+# Above this many paths, `git add` reads them from a NUL-separated pathspec
+# file instead of argv (Windows caps a command line at 32K characters).
+_GIT_ADD_MAX_ARGV_PATHS = 100
+
+
+def _git_add_pathspec_file(filenames: list[str]) -> int:
+    """Stage many files with one `git add --pathspec-from-file` invocation."""
+    import tempfile
+
+    from codeup.console import dim
+
+    fd, pathspec_file = tempfile.mkstemp(prefix="codeup-add-", suffix=".txt")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(b"\0".join(os.fsencode(name) for name in filenames))
+        dim(f"Running: git add --pathspec-from-file ({len(filenames)} files)")
+        exit_code, _, _ = _run_git_command(
+            [
+                "git",
+                "add",
+                f"--pathspec-from-file={pathspec_file}",
+                "--pathspec-file-nul",
+            ],
+            capture_output=False,
+        )
+        return exit_code
+    finally:
+        os.unlink(pathspec_file)
+
+
 def git_add_files(filenames: list[str]) -> int:
     """Run `git add -- <files...>` for an explicit file list."""
     try:
@@ -677,11 +774,14 @@ def git_add_files(filenames: list[str]) -> int:
         if not unique_filenames:
             return 0
 
-        dim(f"Running: git add -- {' '.join(unique_filenames)}")
-        exit_code, _, _ = _run_git_command(
-            ["git", "add", "--", *unique_filenames],
-            capture_output=False,
-        )
+        if len(unique_filenames) > _GIT_ADD_MAX_ARGV_PATHS:
+            exit_code = _git_add_pathspec_file(unique_filenames)
+        else:
+            dim(f"Running: git add -- {' '.join(unique_filenames)}")
+            exit_code, _, _ = _run_git_command(
+                ["git", "add", "--", *unique_filenames],
+                capture_output=False,
+            )
         if exit_code != 0:
             error(f"git add -- <files> returned {exit_code}")
         return exit_code
@@ -1026,6 +1126,61 @@ def git_fetch() -> int:
         return 1
 
 
+def _non_interactive_git_env() -> dict[str, str]:
+    """Return an environment in which git fails instead of prompting for auth."""
+    env = os.environ.copy()
+    env["GIT_TERMINAL_PROMPT"] = "0"
+    ssh_command = env.get("GIT_SSH_COMMAND") or "ssh"
+    env["GIT_SSH_COMMAND"] = f"{ssh_command} -o BatchMode=yes"
+    return env
+
+
+class BackgroundFetch:
+    """A quiet `git fetch` running on a daemon thread.
+
+    Started before lint/test so the network round trip overlaps with them;
+    call wait() before anything reads the remote-tracking refs. The fetch
+    never prompts for credentials, since that would land in the middle of
+    lint/test output; on failure the caller retries with git_fetch().
+    """
+
+    def __init__(self) -> None:
+        self._exit_code = 1
+        self._thread = threading.Thread(target=self._run, name="GitFetch", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        try:
+            self._exit_code, _, stderr = _run_git_command(
+                ["git", "fetch"], quiet=True, env=_non_interactive_git_env()
+            )
+            if self._exit_code != 0:
+                logger.warning(f"Background git fetch failed: {stderr.strip()}")
+        except KeyboardInterrupt:  # noqa
+            logger.info("Background git fetch interrupted by user")
+            interrupt_main()
+        except Exception as e:
+            logger.error(f"Error in background git fetch: {e}")
+
+    def wait(self) -> int:
+        """Block until the fetch finishes and return its exit code."""
+        self._thread.join()
+        return self._exit_code
+
+
+def get_fetch_head_age() -> float | None:
+    """Return seconds since the last `git fetch`, or None if unknown.
+
+    Reads the mtime of .git/FETCH_HEAD in the current directory, which git
+    rewrites on every fetch.
+    """
+    try:
+        mtime = os.path.getmtime(os.path.join(".git", "FETCH_HEAD"))
+    except OSError:
+        return None
+    return max(0.0, time.time() - mtime)
+
+
 def safe_rebase_try() -> bool:
     """Attempt a safe rebase using proper git commands. Returns True if successful or no rebase needed."""
     try:
@@ -13,6 +13,7 @@ import _thread
 import hashlib
 import logging
 import os
+import shlex
 import sys
 import threading
 import time
@@ -22,15 +23,18 @@ from pathlib import Path
 
 from running_process import RunningProcess
 from running_process.compat import PIPE
-from running_process.output_formatter import NullOutputFormatter
 
 from codeup.aicommit import ai_commit_or_prompt_for_commit_message
 from codeup.args import Args
 from codeup.console import dim, error, git_status_summary, info, success, warning
 from codeup.git_utils import (
+    _NULL_FORMATTER,
+    BackgroundFetch,
     check_rebase_needed,
+    clear_branch_cache,
     enhanced_attempt_rebase,
     get_current_branch,
+    get_fetch_head_age,
     get_git_diff,
     get_git_diff_cached,
     get_main_branch,
@@ -45,27 +49,24 @@ from codeup.git_utils import (
     has_modified_tracked_files,
     has_unpushed_commits,
     interactive_add_untracked_files,
+    interrupt_main,
     safe_push,
 )
-from codeup.keyring import (
-    clear_anthropic_api_key,
-    clear_openai_api_key,
-    set_anthropic_api_key,
-    set_openai_api_key,
-)
 from codeup.timestamp_formatter import TimestampOutputFormatter
 from codeup.utils import (
-    _exec,
+    BatchedLineWriter,
     _publish,
     _to_exec_args,
-    _to_exec_str,
+    _which,
     check_environment,
     configure_logging,
+    flush_logging,
     get_answer_yes_or_no,
     get_next_process_output,
     get_process_output_iterator,
     is_uv_project,
     set_interrupted,
+    write_output_line,
 )
 
 # Logger will be configured in main() based on --log flag
@@ -270,8 +271,14 @@ if sys.platform == "win32":
 
 IS_UV_PROJECT = is_uv_project()
 
-# Global activity tracker for timeout handling
-_activity_tracker = None
+# uv prints this when the lockfile can't be resolved; lint output is scanned
+# for it to decide whether to offer 'uv pip install -e . --refresh'.
+_UV_NO_SOLUTION = "No solution found when resolving dependencies"
+_UV_REFRESH_ATTEMPTS = 3
+_UV_TRANSIENT_ERRORS = ("Connection", "connection", "Timeout", "timed out")
+
+# Monotonic time of the last streamed output line, read by the watchdog
+_last_activity_time = time.monotonic()
 
 # Global command context for timeout diagnostics
 _current_command_context = None
@@ -284,10 +291,10 @@ _TIMEOUT_MONITORED_PHASES = {
 }
 
 
-def _set_activity_tracker(tracker):
-    """Set the global activity tracker."""
-    global _activity_tracker
-    _activity_tracker = tracker
+def _mark_activity() -> None:
+    """Record that the running command just produced output."""
+    global _last_activity_time
+    _last_activity_time = time.monotonic()
 
 
 def _set_current_command_context(context):
@@ -319,11 +326,15 @@ def _run_command_streaming(
     phase: str = "COMMAND",
 ) -> tuple[int, str, str]:
     """Run a command with RunningProcess and track activity for timeout."""
+    global _last_activity_time
+    # Resolved per call (not at import) so tests can patch codeup.utils
+    from codeup.utils import is_interrupted, process_is_running
+
     stdout_lines = []
     stderr_lines = []
 
     if output_formatter is None:
-        output_formatter = NullOutputFormatter()
+        output_formatter = _NULL_FORMATTER
 
     # Track command context for timeout diagnostics
     _set_current_command_context(
@@ -345,6 +356,8 @@ def _run_command_streaming(
         stderr=PIPE,
     )
     output_iterator = get_process_output_iterator(rp, timeout=1.0)
+    stdout_writer = BatchedLineWriter(sys.stdout)
+    stderr_writer = BatchedLineWriter(sys.stderr)
 
     try:
         while True:
@@ -356,8 +369,8 @@ def _run_command_streaming(
                 )
             except TimeoutError:
                 # Quiet commands are normal. Keep polling so Ctrl+C remains responsive.
-                from codeup.utils import is_interrupted, process_is_running
-
+                stdout_writer.flush()
+                stderr_writer.flush()
                 if is_interrupted():
                     rp.kill()
                     raise KeyboardInterrupt("Process interrupted") from None
@@ -375,24 +388,16 @@ def _run_command_streaming(
                     else:
                         stdout_lines.append(line)
                 if not quiet:
-                    output_stream = (
-                        sys.stderr if stream_name == "stderr" else sys.stdout
-                    )
-                    print(line, file=output_stream, flush=True)
+                    write_output_line(stream_name, line, stdout_writer, stderr_writer)
 
-                # Update activity tracker when we receive output
-                if _activity_tracker is not None:
-                    _activity_tracker[0] = time.time()
+                # Update activity time when we receive output
+                _last_activity_time = time.monotonic()
 
                 # Check if process was interrupted by Ctrl+C
-                from codeup.utils import is_interrupted
-
                 if is_interrupted():
                     rp.kill()
                     raise KeyboardInterrupt("Process interrupted")
     except KeyboardInterrupt:
-        from codeup.git_utils import interrupt_main
-
         interrupt_main()
         rp.kill()
         raise
@@ -401,6 +406,9 @@ def _run_command_streaming(
             f"Exception during line iteration (streaming may be affected): {e}"
         )
         rp.kill()  # Kill the process on timeout or other exceptions
+    finally:
+        stdout_writer.flush()
+        stderr_writer.flush()
 
     rp.wait()
     stdout_text = "\n".join(stdout_lines) if capture_output else ""
@@ -412,21 +420,54 @@ def _run_command_streaming(
     return rp.returncode or 0, stdout_text, stderr_text
 
 
+def _refresh_uv_dependencies() -> bool:
+    """Run 'uv pip install -e . --refresh', retrying only on network errors.
+
+    A resolution failure will fail the same way again, so only errors that
+    look transient (connection drops, timeouts) get another attempt.
+    """
+    for attempt in range(_UV_REFRESH_ATTEMPTS):
+        dim("Running: uv pip install -e . --refresh")
+        rtn, stdout, stderr = _run_command_streaming(
+            [_which("uv") or "uv", "pip", "install", "-e", ".", "--refresh"],
+            quiet=False,
+            capture_output=True,
+            phase="UV_REFRESH",
+        )
+        if rtn == 0:
+            return True
+        output = stderr or stdout
+        if attempt + 1 < _UV_REFRESH_ATTEMPTS and any(
+            marker in output for marker in _UV_TRANSIENT_ERRORS
+        ):
+            warning("uv hit a network error, retrying...")
+            continue
+        break
+    return False
+
+
 def _main_worker() -> int:
     """Worker function that runs the main codeup logic."""
 
     args = Args.parse_args()
     configure_logging(args.log)
+    # Branch names cached by an earlier run in this process may be stale
+    clear_branch_cache()
     verbose = args.verbose
 
-    # Handle key setting flags
+    # Handle key setting flags. codeup.keyring pulls in semi_secret/cryptography,
+    # so it is only imported on these branches.
     if args.set_key_anthropic:
+        from codeup.keyring import set_anthropic_api_key
+
         if set_anthropic_api_key(args.set_key_anthropic):
             return 0
         else:
             return 1
 
     if args.set_key_openai:
+        from codeup.keyring import set_openai_api_key
+
         if set_openai_api_key(args.set_key_openai):
             return 0
         else:
@@ -434,6 +475,8 @@ def _main_worker() -> int:
 
     # Handle key clearing flags
     if args.clear_key_anthropic:
+        from codeup.keyring import clear_anthropic_api_key
+
         clear_anthropic_api_key()
         # Check if key still exists in environment variable
         if os.environ.get("ANTHROPIC_API_KEY"):
@@ -444,6 +487,8 @@ def _main_worker() -> int:
         return 0
 
     if args.clear_key_openai:
+        from codeup.keyring import clear_openai_api_key
+
         clear_openai_api_key()
         # Check if key still exists in environment variable
         if os.environ.get("OPENAI_API_KEY"):
@@ -488,18 +533,15 @@ def _main_worker() -> int:
             if should_run_lint and os.path.exists("./lint"):
                 print(LINTING_BANNER, end="")
 
-                cmd = "./lint" + (" --verbose" if verbose else "")
-                cmd = _to_exec_str(cmd, bash=True)
+                lint_script = "./lint" + (" --verbose" if verbose else "")
+                cmd_parts = _to_exec_args(lint_script, bash=True)
 
                 # Use streaming process that captures output AND streams in real-time
                 uv_resolved_dependencies = True
                 try:
-                    cmd_parts = _to_exec_args(
-                        "./lint" + (" --verbose" if verbose else ""), bash=True
-                    )
                     logger.debug(f"Running lint with command parts: {cmd_parts}")
 
-                    dim(f"Running: {cmd}")
+                    dim(f"Running: {shlex.join(cmd_parts)}")
                     # Run with streaming AND capture for dependency detection
                     rtn, stdout, stderr = _run_command_streaming(
                         cmd_parts,
@@ -511,8 +553,7 @@ def _main_worker() -> int:
                     )
 
                     # Check captured output for dependency resolution issues
-                    output_text = stdout + stderr
-                    if "No solution found when resolving dependencies" in output_text:
+                    if _UV_NO_SOLUTION in stdout or _UV_NO_SOLUTION in stderr:
                         uv_resolved_dependencies = False
 
                     if rtn != 0:
@@ -530,20 +571,12 @@ def _main_worker() -> int:
                         info(
                             "Dry-run mode: automatically running 'uv pip install -e . --refresh'"
                         )
-                        for _ in range(3):
-                            refresh_rtn = _exec(
-                                "uv pip install -e . --refresh", bash=False, die=False
-                            )
-                            if refresh_rtn == 0:
-                                break
-                        else:
+                        if not _refresh_uv_dependencies():
                             error("uv pip install -e . --refresh failed.")
                             return 1
                 except KeyboardInterrupt:
                     logger.info("Dry-run linting interrupted by user")
                     set_interrupted()
-                    from codeup.git_utils import interrupt_main
-
                     interrupt_main()
                     raise
                 except Exception as e:
@@ -555,14 +588,11 @@ def _main_worker() -> int:
             if should_run_test and os.path.exists("./test"):
                 print(TESTING_BANNER, end="")
 
-                test_cmd = "./test" + (" --verbose" if verbose else "")
-                test_cmd = _to_exec_str(test_cmd, bash=True)
+                test_script = "./test" + (" --verbose" if verbose else "")
+                test_cmd_parts = _to_exec_args(test_script, bash=True)
 
-                dim(f"Running: {test_cmd}")
+                dim(f"Running: {shlex.join(test_cmd_parts)}")
                 try:
-                    test_cmd_parts = _to_exec_args(
-                        "./test" + (" --verbose" if verbose else ""), bash=True
-                    )
                     logger.debug(f"Running test with command parts: {test_cmd_parts}")
 
                     # Run tests with streaming output (no need to capture for tests)
@@ -580,8 +610,6 @@ def _main_worker() -> int:
                 except KeyboardInterrupt:
                     logger.info("Dry-run testing interrupted by user")
                     set_interrupted()
-                    from codeup.git_utils import interrupt_main
-
                     interrupt_main()
                     raise
                 except Exception as e:
@@ -596,8 +624,6 @@ def _main_worker() -> int:
             logger.info("Dry-run interrupted by user")
             set_interrupted()
             warning("Aborting")
-            from codeup.git_utils import interrupt_main
-
             interrupt_main()
             raise
         except Exception as e:
@@ -621,8 +647,6 @@ def _main_worker() -> int:
             logger.info("just-ai-commit interrupted by user")
             set_interrupted()
             warning("Aborting")
-            from codeup.git_utils import interrupt_main
-
             interrupt_main()
             raise
         except Exception as e:
@@ -655,8 +679,6 @@ def _main_worker() -> int:
                     unpushed_files = get_unpushed_commit_files()
             except KeyboardInterrupt:
                 logger.info("Unpushed commit check interrupted by user")
-                from codeup.git_utils import interrupt_main
-
                 interrupt_main()
                 raise
             except Exception as e:
@@ -705,24 +727,34 @@ def _main_worker() -> int:
             success("Pre-test check passed: all files are tracked")
             return 0
 
+        # Start fetching now so the network round trip overlaps with lint/test,
+        # unless a fetch just happened
+        background_fetch = None
+        if not args.no_push:
+            fetch_age = get_fetch_head_age()
+            if fetch_age is None or fetch_age >= args.fetch_max_age:
+                dim("Running: git fetch (in background)")
+                background_fetch = BackgroundFetch()
+
         validation_snapshot = _capture_worktree_snapshot() if has_changes else None
         ran_validation_commands = False
 
-        if os.path.exists("./lint") and not args.no_lint:
+        # Look each script up once, and only for steps that are enabled
+        run_lint = not args.no_lint and os.path.exists("./lint")
+        run_test = not args.no_test and os.path.exists("./test")
+
+        if run_lint:
             print(LINTING_BANNER, end="")
 
-            cmd = "./lint" + (" --verbose" if verbose else "")
-            cmd = _to_exec_str(cmd, bash=True)
+            lint_script = "./lint" + (" --verbose" if verbose else "")
+            cmd_parts = _to_exec_args(lint_script, bash=True)
 
             # Use streaming process that captures output AND streams in real-time
             uv_resolved_dependencies = True
             try:
-                cmd_parts = _to_exec_args(
-                    "./lint" + (" --verbose" if verbose else ""), bash=True
-                )
                 logger.debug(f"Running lint with command parts: {cmd_parts}")
 
-                dim(f"Running: {cmd}")
+                dim(f"Running: {shlex.join(cmd_parts)}")
                 # Run with streaming AND capture for dependency detection
                 rtn, stdout, stderr = _run_command_streaming(
                     cmd_parts,
@@ -735,8 +767,7 @@ def _main_worker() -> int:
                 ran_validation_commands = True
 
                 # Check captured output for dependency resolution issues
-                output_text = stdout + stderr
-                if "No solution found when resolving dependencies" in output_text:
+                if _UV_NO_SOLUTION in stdout or _UV_NO_SOLUTION in stderr:
                     uv_resolved_dependencies = False
 
                 if rtn != 0:
@@ -763,20 +794,12 @@ def _main_worker() -> int:
                         if not answer_yes:
                             warning("Aborting.")
                             sys.exit(1)
-                    for _ in range(3):
-                        refresh_rtn = _exec(
-                            "uv pip install -e . --refresh", bash=False, die=False
-                        )
-                        if refresh_rtn == 0:
-                            break
-                    else:
+                    if not _refresh_uv_dependencies():
                         error("uv pip install -e . --refresh failed.")
                         sys.exit(1)
             except KeyboardInterrupt:
                 logger.info("Linting interrupted by user")
                 set_interrupted()
-                from codeup.git_utils import interrupt_main
-
                 interrupt_main()
                 raise
             except Exception as e:
@@ -797,17 +820,14 @@ def _main_worker() -> int:
                     )
                     return 1
                 validation_snapshot = post_lint_snapshot
-        if not args.no_test and os.path.exists("./test"):
+        if run_test:
             print(TESTING_BANNER, end="")
 
-            test_cmd = "./test" + (" --verbose" if verbose else "")
-            test_cmd = _to_exec_str(test_cmd, bash=True)
+            test_script = "./test" + (" --verbose" if verbose else "")
+            test_cmd_parts = _to_exec_args(test_script, bash=True)
 
-            dim(f"Running: {test_cmd}")
+            dim(f"Running: {shlex.join(test_cmd_parts)}")
             try:
-                test_cmd_parts = _to_exec_args(
-                    "./test" + (" --verbose" if verbose else ""), bash=True
-                )
                 logger.debug(f"Running test with command parts: {test_cmd_parts}")
 
                 # Run tests with streaming output (no need to capture for tests)
@@ -826,8 +846,6 @@ def _main_worker() -> int:
             except KeyboardInterrupt:
                 logger.info("Testing interrupted by user")
                 set_interrupted()
-                from codeup.git_utils import interrupt_main
-
                 interrupt_main()
                 raise
             except Exception as e:
@@ -835,12 +853,7 @@ def _main_worker() -> int:
                 error(f"Testing error: {e}")
                 sys.exit(1)
 
-        if (
-            ran_validation_commands
-            and validation_snapshot is not None
-            and not args.no_test
-            and os.path.exists("./test")
-        ):
+        if ran_validation_commands and validation_snapshot is not None and run_test:
             current_snapshot = _capture_worktree_snapshot()
             unexpected_changes = _describe_unexpected_worktree_changes(
                 validation_snapshot,
@@ -878,9 +891,14 @@ def _main_worker() -> int:
             info("Skipping git add and commit - no new changes to commit.")
 
         if not args.no_push:
-            # Fetch latest changes from remote
-            info("Fetching latest changes from remote...")
-            git_fetch()
+            # Make sure the remote-tracking refs are current before rebasing
+            fetched = background_fetch is not None
+            if background_fetch is not None:
+                info("Fetching latest changes from remote...")
+                if background_fetch.wait() != 0:
+                    git_fetch()  # Retry in the foreground so errors are shown
+            else:
+                info(f"Using cached fetch from {fetch_age:.0f}s ago")
 
             # Check if rebase is needed and handle it
             if not args.no_rebase:
@@ -975,6 +993,10 @@ def _main_worker() -> int:
             if not safe_push():
                 # If push still fails, check if we need to try the enhanced rebase approach
                 warning("Push failed. Checking if enhanced rebase is needed...")
+                if not fetched:
+                    # The cached fetch may predate whatever the remote rejected
+                    info("Fetching latest changes from remote...")
+                    git_fetch()
 
                 # Refresh the rebase status check after potential changes
                 current_branch = get_current_branch()
@@ -1025,8 +1047,6 @@ def _main_worker() -> int:
         logger.info("codeup main function interrupted by user")
         set_interrupted()
         warning("Aborting")
-        from codeup.git_utils import interrupt_main
-
         interrupt_main()
         raise
     except Exception as e:
@@ -1125,17 +1145,16 @@ def main() -> int:
     # Global variable to store the result from the worker thread
     result = [1]  # Default to error exit code
 
-    # Global variable to track the last activity time for test output monitoring
-    last_activity_time = [time.time()]
-
-    # Set up the activity tracker
-    _set_activity_tracker(last_activity_time)
+    # Start the test output inactivity clock now
+    _mark_activity()
 
     def timeout_handler():
         """Handle timeout by checking test output activity, warn at 4 min, timeout at 5 min."""
         warned = False
+        sleep_for = 60.0
         while True:
-            time.sleep(60)  # Check every minute
+            time.sleep(sleep_for)
+            sleep_for = 60.0  # Check at least every minute
 
             if not _is_timeout_monitored_phase():
                 warned = False
@@ -1145,8 +1164,7 @@ def main() -> int:
                 warned = False
                 continue
 
-            current_time = time.time()
-            time_since_last_activity = current_time - last_activity_time[0]
+            time_since_last_activity = time.monotonic() - _last_activity_time
 
             # Reset warning flag if activity resumed
             if time_since_last_activity < 240 and warned:
@@ -1180,8 +1198,14 @@ def main() -> int:
                 _dump_all_thread_stacks()
 
                 _thread.interrupt_main()
+                # os._exit skips atexit, which would drop the queued timeout logs
+                flush_logging()
                 os._exit(1)
 
+            # Wake up at the next deadline instead of a full minute later
+            deadline = 300 if warned else 240
+            sleep_for = min(60.0, max(1.0, deadline - time_since_last_activity))
+
     def worker_wrapper():
         """Wrapper for the main worker that stores the result."""
         try:
@@ -1228,6 +1252,7 @@ def main() -> int:
         # Force exit if worker thread is still alive (daemon thread won't block,
         # but os._exit ensures immediate termination of any lingering subprocesses)
         if worker_thread.is_alive():
+            flush_logging()
             os._exit(1)
         return 1
 
@@ -4,15 +4,24 @@ This module provides lexical parsing of shebang lines to handle modern
 patterns like UV's '#!/usr/bin/env -S uv run --python 3.12' accurately.
 """
 
+import errno
+import functools
+import os
 import shlex
+import shutil
 import sys
 from dataclasses import dataclass
 from pathlib import Path
 
 from running_process import RunningProcess
 
+_IS_WINDOWS = sys.platform == "win32"
 
-@dataclass(frozen=True)
+# Bytes read from the top of a script when looking for its shebang line
+_SHEBANG_READ_SIZE = 256
+
+
+@dataclass(frozen=True, slots=True)
 class ShebangResult:
     """Result of shebang parsing containing program and arguments."""
 
@@ -20,17 +29,72 @@ class ShebangResult:
     args: list[str]
 
 
+@functools.lru_cache(maxsize=256)
+def _read_shebang_line(script_path: str, mtime_ns: int) -> str | None:
+    """Return a script's '#!' line, cached until the file's mtime changes."""
+    try:
+        # Kernels cap the shebang line at a few hundred bytes, so one small
+        # raw read is enough and skips building a buffered text reader.
+        fd = os.open(script_path, os.O_RDONLY)
+        try:
+            head = os.read(fd, _SHEBANG_READ_SIZE)
+        finally:
+            os.close(fd)
+        if not head.startswith(b"#!"):
+            return None
+        # An overlong first line may be cut mid-character, so decode leniently
+        return head.split(b"\n", 1)[0].decode("utf-8", errors="replace").strip()
+    except OSError:
+        return None
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_shebang_line(shebang_line: str) -> tuple[str, tuple[str, ...]] | None:
+    """Parse a '#!' line into (program, args), cached by the raw line.
+
+    Scripts are re-parsed on every lint/test run but their first lines almost
+    never change. Args are kept as a tuple so no caller can alter the cache.
+    """
+    result = ShebangProcessor._lex_parse_command_line(shebang_line[2:].strip())
+    if result is None:
+        return None
+    return result.program, tuple(result.args)
+
+
+@functools.lru_cache(maxsize=1)
+def _cached_bash_exe() -> str | None:
+    """Locate bash once per process with PATH lookup and file checks only."""
+    bash_in_path = shutil.which("bash")
+    if bash_in_path:
+        return bash_in_path
+
+    # Common locations for bash on Windows when it isn't on PATH
+    possible_paths = [
+        r"C:\Program Files\Git\bin\bash.exe",
+        r"C:\msys64\usr\bin\bash.exe",
+        r"C:\msys32\usr\bin\bash.exe",
+        r"C:\cygwin64\bin\bash.exe",
+        r"C:\cygwin\bin\bash.exe",
+    ]
+
+    for path in possible_paths:
+        if os.path.isfile(path):
+            return path
+
+    return None
+
+
 class ShebangProcessor:
     """Handles lexical shebang parsing and cross-platform script execution."""
 
     def __init__(self):
         """Initialize the ShebangProcessor."""
         self._bash_exe = None
-        if sys.platform == "win32":
+        if _IS_WINDOWS:
             self._bash_exe = self._find_bash_executable()
 
     def lex_parse_shebang(self, shebang_line: str) -> ShebangResult | None:
-        """Lexically parse shebang line using shlex for accurate token extraction.
+        """Lexically parse shebang line, using shlex when quoting is present.
 
         Args:
             shebang_line: The shebang line to parse (e.g., "#!/usr/bin/env -S uv run")
@@ -48,14 +112,26 @@ class ShebangProcessor:
         if not shebang_line or not shebang_line.startswith("#!"):
             return None
 
-        # Remove the #! prefix and strip whitespace
-        command_line = shebang_line[2:].strip()
+        parsed = _parse_shebang_line(shebang_line)
+        if parsed is None:
+            return None
+        # A fresh result per call, so callers may modify its args list
+        program, args = parsed
+        return ShebangResult(program=program, args=list(args))
+
+    @staticmethod
+    def _lex_parse_command_line(command_line: str) -> ShebangResult | None:
+        """Tokenize the text after '#!' and build the ShebangResult."""
         if not command_line:
             return None
 
         try:
-            # Use shlex to properly tokenize the command line
-            tokens = shlex.split(command_line)
+            if '"' in command_line or "'" in command_line or "\\" in command_line:
+                # Use shlex to properly tokenize quoted or escaped arguments
+                tokens = shlex.split(command_line)
+            else:
+                # Plain shebangs split identically on whitespace, much faster
+                tokens = command_line.split()
             if not tokens:
                 return None
 
@@ -70,7 +146,7 @@ class ShebangProcessor:
 
             # Check for /usr/bin/env patterns
             if tokens[0].endswith("/env"):
-                return self._parse_env_shebang(tokens[1:])
+                return ShebangProcessor._parse_env_shebang(tokens[1:])
             else:
                 # Direct interpreter with args: #!/usr/bin/python3 -u -O
                 program = Path(tokens[0]).name
@@ -81,7 +157,8 @@ class ShebangProcessor:
             # shlex.split can raise ValueError for malformed input
             return None
 
-    def _parse_env_shebang(self, env_args: list[str]) -> ShebangResult | None:
+    @staticmethod
+    def _parse_env_shebang(env_args: list[str]) -> ShebangResult | None:
         """Parse env-based shebang arguments.
 
         Args:
@@ -113,31 +190,7 @@ class ShebangProcessor:
         Returns:
             Path to bash executable or None if not found
         """
-        # Common locations for bash on Windows
-        possible_paths = [
-            "bash",  # If in PATH
-            r"C:\Program Files\Git\bin\bash.exe",
-            r"C:\msys64\usr\bin\bash.exe",
-            r"C:\msys32\usr\bin\bash.exe",
-            r"C:\cygwin64\bin\bash.exe",
-            r"C:\cygwin\bin\bash.exe",
-        ]
-
-        for path in possible_paths:
-            try:
-                rp = RunningProcess(
-                    [path, "--version"], timeout=5, auto_run=True, check=False
-                )
-                # Consume output to prevent pipe buffer deadlock
-                for _ in rp.line_iter(timeout=5):
-                    pass
-                rp.wait()
-                if rp.returncode == 0:
-                    return path
-            except (FileNotFoundError, OSError):
-                continue
-
-        return None
+        return _cached_bash_exe()
 
     def resolve_interpreter(self, interpreter: str) -> str:
         """Resolve interpreter path to Windows-compatible executable.
@@ -148,7 +201,7 @@ class ShebangProcessor:
         Returns:
             Resolved interpreter path
         """
-        if sys.platform != "win32":
+        if not _IS_WINDOWS:
             return interpreter
 
         # Special handling for common interpreters on Windows
@@ -171,11 +224,13 @@ class ShebangProcessor:
             ShebangResult or None if no shebang found
         """
         try:
-            with open(script_path, encoding="utf-8") as f:
-                first_line = f.readline().strip()
-                return self.lex_parse_shebang(first_line)
-        except (OSError, UnicodeDecodeError):
+            mtime_ns = os.stat(script_path).st_mtime_ns
+        except OSError:
+            return None
+        first_line = _read_shebang_line(script_path, mtime_ns)
+        if first_line is None:
             return None
+        return self.lex_parse_shebang(first_line)
 
     def get_execution_command(
         self, script_path: str, script_args: list[str] | None = None
@@ -188,13 +243,26 @@ class ShebangProcessor:
 
         Returns:
             Command list ready for subprocess execution
+
+        Raises:
+            PermissionError: On POSIX, if the script has no shebang and is not
+                executable
         """
         if script_args is None:
             script_args = []
 
         shebang_result = self.parse_shebang(script_path)
         if not shebang_result:
-            # No shebang found, try direct execution
+            # No shebang found, try direct execution. Report a non-executable
+            # script up front instead of spawning just to get EACCES back.
+            if (
+                not _IS_WINDOWS
+                and os.path.isfile(script_path)
+                and not os.access(script_path, os.X_OK)
+            ):
+                raise PermissionError(
+                    errno.EACCES, "Script is not executable", script_path
+                )
             return [script_path] + script_args
 
         resolved_program = self.resolve_interpreter(shebang_result.program)
@@ -202,33 +270,36 @@ class ShebangProcessor:
         return [resolved_program] + shebang_result.args + [script_path] + script_args
 
     def execute_script(
-        self, script_path: str, script_args: list[str] | None = None, **kwargs
+        self,
+        script_path: str,
+        script_args: list[str] | None = None,
+        cwd: str | Path | None = None,
+        timeout: int | None = None,
     ) -> int:
         """Execute script with cross-platform shebang handling.
 
         Args:
             script_path: Path to the script file
             script_args: Additional arguments to pass to the script
-            **kwargs: Additional keyword arguments (cwd, timeout supported)
+            cwd: Working directory for the script
+            timeout: Process timeout in seconds; output reads default to 600
 
         Returns:
             Exit code from script execution
         """
-        command = self.get_execution_command(script_path, script_args)
-
         try:
-            # Filter kwargs that are compatible with RunningProcess
-            rp_kwargs = {}
-            if "cwd" in kwargs:
-                rp_kwargs["cwd"] = kwargs["cwd"]
-            if "timeout" in kwargs:
-                rp_kwargs["timeout"] = kwargs["timeout"]
-
-            rp = RunningProcess(command, auto_run=True, check=False, **rp_kwargs)
+            command = self.get_execution_command(script_path, script_args)
+            rp = RunningProcess(
+                command,
+                cwd=Path(cwd) if cwd is not None else None,
+                timeout=timeout,
+                auto_run=True,
+                check=False,
+            )
 
             # Consume output to prevent pipe buffer deadlock
-            # Use the timeout from kwargs or default to 600 seconds
-            timeout_value = kwargs.get("timeout", 600)
+            # Use the given timeout or default to 600 seconds
+            timeout_value = 600 if timeout is None else timeout
             for line in rp.line_iter(timeout=timeout_value):
                 # Stream output to stdout in real-time
                 print(line, flush=True)
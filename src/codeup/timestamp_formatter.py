@@ -10,11 +10,11 @@ class TimestampOutputFormatter:
     """
 
     def __init__(self) -> None:
-        self._start_time: float | None = None
+        self._start_ns: int | None = None
 
     def begin(self) -> None:
         """Record the start time when output begins."""
-        self._start_time = time.time()
+        self._start_ns = time.monotonic_ns()
 
     def transform(self, line: str) -> str:
         """Transform output line by prepending elapsed time.
@@ -25,13 +25,15 @@ class TimestampOutputFormatter:
         Returns:
             Line with timestamp prepended in format "0.01 (original line)"
         """
-        if self._start_time is None:
+        if self._start_ns is None:
             # Fallback if begin() wasn't called
-            self._start_time = time.time()
+            self._start_ns = time.monotonic_ns()
 
-        elapsed = time.time() - self._start_time
-        return f"{elapsed:.2f} {line}"
+        # Integer centiseconds on the monotonic clock: no float formatting and
+        # no backwards jumps when the wall clock is adjusted.
+        sec, cs = divmod((time.monotonic_ns() - self._start_ns) // 10_000_000, 100)
+        return f"{sec}.{cs:02d} {line}"
 
     def end(self) -> None:
         """Reset state when output ends."""
-        self._start_time = None
+        self._start_ns = None
@@ -1,20 +1,30 @@
 """Utility functions for CodeUp."""
 
+import atexit
+import functools
 import importlib
 import logging
 import os
+import queue
+import selectors
 import shlex
-import subprocess
+import shutil
 import sys
 import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
-from shutil import which
+from typing import cast
 
 from running_process import RunningProcess
 from running_process.compat import PIPE
-from running_process.output_formatter import NullOutputFormatter
 
-from codeup.git_utils import find_git_directory
+from codeup.git_utils import (
+    _NULL_FORMATTER,
+    find_git_directory,
+    interrupt_main,
+    set_git_executable,
+)
 
 
 def _load_running_process_end_of_stream_type():
@@ -30,6 +40,8 @@ _RunningProcessEndOfStream = _load_running_process_end_of_stream_type()
 
 logger = logging.getLogger(__name__)
 
+_IS_WINDOWS = sys.platform == "win32"
+
 # ANSI color codes
 RED = "\033[91m"
 RESET = "\033[0m"
@@ -37,6 +49,11 @@ RESET = "\033[0m"
 # Global interrupt flag - set when user presses Ctrl-C
 _interrupted = False
 
+# Background thread that writes queued log records (see configure_logging)
+_log_listener: QueueListener | None = None
+# (log file path or None, root QueueHandler) for the active configuration
+_log_config: tuple[str | None, QueueHandler] | None = None
+
 
 def set_interrupted() -> None:
     """Mark that the process has been interrupted by user."""
@@ -119,6 +136,11 @@ def get_next_process_output(
             outputs.append(("stderr", stderr_line))
 
         if outputs:
+            # Take whatever else is already buffered in the same call so chatty
+            # commands are handled a batch at a time instead of line by line.
+            drain_combined = getattr(process, "drain_combined", None)
+            if callable(drain_combined):
+                outputs.extend(cast(list[tuple[str, str | bytes]], drain_combined()))
             return outputs
 
         if is_end_of_stream(process, stdout_line) or is_end_of_stream(
@@ -132,16 +154,62 @@ def get_next_process_output(
     return [("stdout", line)]
 
 
-def is_suspicious_file(filename: str) -> bool:
-    """Check if a file has a suspicious extension that typically shouldn't be committed.
+class BatchedLineWriter:
+    """Print streamed lines to a text stream, flushing at most every ``interval``.
 
-    Args:
-        filename: The filename to check
+    ``print(..., flush=True)`` per line costs one write syscall per line of
+    child output. Lines are printed unflushed instead, and the stream is
+    flushed once ``interval`` seconds have passed since the last flush.
+    Call ``flush()`` when output goes quiet and once the command finishes.
+    """
 
-    Returns:
-        True if the file has a suspicious extension
+    def __init__(self, stream, interval: float = 0.05) -> None:
+        self._stream = stream
+        self._write = stream.write
+        self._interval = interval
+        self._last_flush = time.monotonic()
+        self._pending = False
+
+    def write_line(self, line: str | bytes) -> None:
+        self._write(f"{line}\n")
+        now = time.monotonic()
+        if now - self._last_flush >= self._interval:
+            self._stream.flush()
+            self._last_flush = now
+            self._pending = False
+        else:
+            self._pending = True
+
+    def flush(self) -> None:
+        if self._pending:
+            self._stream.flush()
+            self._last_flush = time.monotonic()
+            self._pending = False
+
+
+def write_output_line(
+    stream_name: str,
+    line: str | bytes,
+    stdout_writer: BatchedLineWriter,
+    stderr_writer: BatchedLineWriter,
+) -> None:
+    """Write a child process line to the writer for its stream.
+
+    The writer being switched away from is flushed first. Otherwise a piped,
+    block-buffered stdout would fall behind a line-buffered stderr and
+    warnings would appear ahead of the output that preceded them.
     """
-    suspicious_patterns = [
+    if stream_name == "stderr":
+        stdout_writer.flush()
+        stderr_writer.write_line(line)
+    else:
+        stderr_writer.flush()
+        stdout_writer.write_line(line)
+
+
+# Extensions of build output, logs and editor/IDE files that rarely belong in a commit
+_SUSPICIOUS_EXTENSIONS = frozenset(
+    {
         ".txt",
         ".log",
         ".tmp",
@@ -165,14 +233,25 @@ def is_suspicious_file(filename: str) -> bool:
         ".bak",
         ".swp",
         ".swo",
-    ]
+    }
+)
 
+
+def is_suspicious_file(filename: str) -> bool:
+    """Check if a file has a suspicious extension that typically shouldn't be committed.
+
+    Args:
+        filename: The filename to check
+
+    Returns:
+        True if the file has a suspicious extension
+    """
     filename_lower = filename.lower()
 
     # Check for exact extension matches
-    for pattern in suspicious_patterns:
-        if filename_lower.endswith(pattern):
-            return True
+    _, dot, extension = filename_lower.rpartition(".")
+    if dot and "." + extension in _SUSPICIOUS_EXTENSIONS:
+        return True
 
     # Check for *tmp*.* pattern (any file with 'tmp' in the name)
     if "tmp" in filename_lower or "temp" in filename_lower:
@@ -233,7 +312,70 @@ def exit_for_missing_user_input() -> None:
     raise SystemExit(1)
 
 
-def input_with_timeout(prompt: str, timeout_seconds: int | None = None) -> str:
+def _selectable_stdin_fd() -> int | None:
+    """Return stdin's file descriptor if prompts can wait on it with selectors.
+
+    Only terminals qualify. In canonical mode each read() returns at most one
+    line, so ``sys.stdin`` never buffers input that select() can't see. Pipes
+    and files use the reader thread instead.
+    """
+    if _IS_WINDOWS:
+        # select() only accepts sockets on Windows
+        return None
+    try:
+        fd = sys.stdin.fileno()
+    except (AttributeError, OSError, ValueError):
+        return None
+    return fd if os.isatty(fd) else None
+
+
+def _input_with_selector(prompt: str, timeout_seconds: float | None, fd: int) -> str:
+    """Prompt and read one line from the terminal on ``fd`` without a helper thread.
+
+    select() only decides when to read; the line itself comes from
+    ``sys.stdin.readline()`` so it goes through the same buffer as input().
+    """
+    deadline = None if timeout_seconds is None else time.monotonic() + timeout_seconds
+
+    # The watchdog recognizes a pending prompt by a frame named "get_input".
+    def get_input() -> str:
+        sys.stdout.write(prompt)
+        sys.stdout.flush()
+        with selectors.DefaultSelector() as selector:
+            selector.register(fd, selectors.EVENT_READ)
+            while True:
+                # Wake up regularly so we can respond to Ctrl+C quickly
+                wait = 0.2
+                if deadline is not None:
+                    wait = min(wait, max(0.0, deadline - time.monotonic()))
+                try:
+                    line = (
+                        sys.stdin.readline() if selector.select(timeout=wait) else None
+                    )
+                except KeyboardInterrupt:
+                    set_interrupted()
+                    interrupt_main()
+                    raise
+                if line is not None:
+                    break
+                if is_interrupted():
+                    raise KeyboardInterrupt("Process interrupted")
+                if deadline is not None and time.monotonic() >= deadline:
+                    logger.warning(f"Input timed out after {timeout_seconds} seconds")
+                    raise InputTimeoutError(
+                        f"Input timed out after {timeout_seconds} seconds"
+                    )
+        if not line:
+            # EOF at a terminal prompt means the user pressed Ctrl-D.
+            set_interrupted()
+            interrupt_main()
+            raise KeyboardInterrupt("Input interrupted (EOFError)")
+        return line.removesuffix("\n").removesuffix("\r")
+
+    return get_input()
+
+
+def input_with_timeout(prompt: str, timeout_seconds: float | None = None) -> str:
     """
     Get user input with a timeout. Raises InputTimeoutError if timeout is reached.
 
@@ -251,6 +393,10 @@ def input_with_timeout(prompt: str, timeout_seconds: int | None = None) -> str:
     if timeout_seconds is None:
         timeout_seconds = get_prompt_timeout_seconds()
 
+    stdin_fd = _selectable_stdin_fd()
+    if stdin_fd is not None:
+        return _input_with_selector(prompt, timeout_seconds, stdin_fd)
+
     result = []
     exception_holder = []
 
@@ -258,16 +404,12 @@ def input_with_timeout(prompt: str, timeout_seconds: int | None = None) -> str:
         try:
             result.append(input(prompt))
         except KeyboardInterrupt:
-            from codeup.git_utils import interrupt_main
-
             set_interrupted()
             interrupt_main()
             raise
         except EOFError:
             if sys.stdin.isatty():
                 # EOFError often indicates Ctrl-C on Windows in interactive mode.
-                from codeup.git_utils import interrupt_main
-
                 set_interrupted()
                 interrupt_main()
                 raise KeyboardInterrupt("Input interrupted (EOFError)") from None
@@ -280,8 +422,6 @@ def input_with_timeout(prompt: str, timeout_seconds: int | None = None) -> str:
     input_thread.start()
 
     # Poll with short joins so we can respond to Ctrl+C quickly
-    import time
-
     deadline = None if timeout_seconds is None else time.time() + timeout_seconds
     while input_thread.is_alive():
         input_thread.join(timeout=0.2)
@@ -317,12 +457,20 @@ def is_uv_project(directory=".") -> bool:
         bool: True if it's a uv project, False otherwise.
     """
     try:
-        required_files = ["pyproject.toml", "uv.lock"]
-        return all(os.path.isfile(os.path.join(directory, f)) for f in required_files)
+        required_files = {"pyproject.toml", "uv.lock"}
+        found = set()
+        # One directory read covers both names instead of a stat per file
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.name in required_files and entry.is_file():
+                    found.add(entry.name)
+                    if found == required_files:
+                        return True
+        return False
+    except (FileNotFoundError, NotADirectoryError):
+        return False
     except KeyboardInterrupt:
         logger.info("is_uv_project interrupted by user")
-        from codeup.git_utils import interrupt_main
-
         interrupt_main()
         raise
     except Exception as e:
@@ -331,29 +479,40 @@ def is_uv_project(directory=".") -> bool:
         return False
 
 
+@functools.cache
+def _which(name: str) -> str | None:
+    """Resolve an executable on PATH once per process."""
+    return shutil.which(name)
+
+
+@functools.cache
 def _find_bash_on_windows() -> str:
     """Find bash executable on Windows by checking common locations.
 
     Prioritizes Git Bash over WSL bash for better script compatibility.
+    The result is cached, so the locations are only probed once per process.
     """
-    # Git Bash locations (prioritized for better script compatibility)
-    git_bash_paths = [
-        r"C:\Program Files\Git\bin\bash.exe",
-        r"C:\Program Files\Git\usr\bin\bash.exe",
-        r"C:\Program Files (x86)\Git\bin\bash.exe",
-        r"C:\Program Files (x86)\Git\usr\bin\bash.exe",
-        r"C:\Git\bin\bash.exe",
-        r"C:\Git\usr\bin\bash.exe",
+    # Git install roots and the bash locations inside each
+    # (prioritized for better script compatibility)
+    git_roots = [
+        r"C:\Program Files\Git",
+        r"C:\Program Files (x86)\Git",
+        r"C:\Git",
     ]
+    git_bash_subpaths = [r"\bin\bash.exe", r"\usr\bin\bash.exe"]
 
-    # Check Git Bash locations first
-    for path in git_bash_paths:
-        if Path(path).exists():
-            logger.debug(f"Found Git Bash at: {path}")
-            return path
+    # Check Git Bash locations first; one stat rules out a root that isn't there
+    for root in git_roots:
+        if not os.path.isdir(root):
+            continue
+        for subpath in git_bash_subpaths:
+            path = root + subpath
+            if os.path.isfile(path):
+                logger.debug(f"Found Git Bash at: {path}")
+                return path
 
     # Check if bash is in PATH (but exclude WSL if we can detect it)
-    bash_path = which("bash")
+    bash_path = _which("bash")
     if bash_path and "System32" not in bash_path:
         logger.debug(f"Found bash in PATH: {bash_path}")
         return bash_path
@@ -365,13 +524,13 @@ def _find_bash_on_windows() -> str:
     ]
 
     for path in other_bash_paths:
-        if Path(path).exists():
+        if os.path.isfile(path):
             logger.debug(f"Found MSYS2 bash at: {path}")
             return path
 
     # WSL bash as last resort
     wsl_bash_path = r"C:\Windows\System32\bash.exe"
-    if Path(wsl_bash_path).exists():
+    if os.path.isfile(wsl_bash_path):
         logger.debug(f"Using WSL bash as fallback: {wsl_bash_path}")
         return wsl_bash_path
 
@@ -380,26 +539,6 @@ def _find_bash_on_windows() -> str:
     return "bash"
 
 
-def _to_exec_str(cmd: str, bash: bool) -> str:
-    """Convert command to properly escaped string for execution.
-
-    Uses subprocess.list2cmdline for secure command building on Windows.
-
-    Args:
-        cmd: The command string to execute
-        bash: Whether to run via bash shell
-
-    Returns:
-        Properly escaped command string
-    """
-    if bash and sys.platform == "win32":
-        bash_exe = _find_bash_on_windows()
-        # Use subprocess.list2cmdline for secure string building
-        args = [bash_exe, "-c", cmd]
-        return subprocess.list2cmdline(args)
-    return cmd
-
-
 def _to_exec_args(cmd: str, bash: bool) -> list[str]:
     """Convert command string to properly escaped argument list for process execution.
 
@@ -410,23 +549,27 @@ def _to_exec_args(cmd: str, bash: bool) -> list[str]:
     Returns:
         List of strings suitable for RunningProcess execution
     """
-    if bash and sys.platform == "win32":
+    if bash and _IS_WINDOWS:
         bash_exe = _find_bash_on_windows()
         # Use list of args to avoid shell injection
         return [bash_exe, "-c", cmd]
     else:
         # For non-bash commands, split properly using shlex
-        return shlex.split(cmd)
+        return list(_split_command(cmd))
+
+
+@functools.lru_cache(maxsize=128)
+def _split_command(cmd: str) -> tuple[str, ...]:
+    """shlex.split, memoized; the same lint/test/git strings recur within a run."""
+    return tuple(shlex.split(cmd))
 
 
 def _exec(cmd: str, bash: bool, die=True) -> int:
+    """Run cmd with streamed output; the bash path execs [bash, "-c", cmd] directly."""
     print(f"Running: {cmd}")
-    original_cmd = cmd
     cmd_parts = _to_exec_args(cmd, bash)
-    command_display = _to_exec_str(cmd, bash)
 
-    logger.debug(f"Original command: {original_cmd}")
-    logger.debug(f"Transformed command: {command_display}")
+    logger.debug(f"Original command: {cmd}")
     logger.debug(f"Bash mode: {bash}")
     logger.debug(f"Command parts: {cmd_parts}")
 
@@ -442,46 +585,51 @@ def _exec(cmd: str, bash: bool, die=True) -> int:
             shell=False,
             auto_run=True,
             check=False,
-            output_formatter=NullOutputFormatter(),
+            output_formatter=_NULL_FORMATTER,
             env=env,
             stderr=PIPE,
         )
         output_iterator = get_process_output_iterator(rp, timeout=1.0)
+        stdout_writer = BatchedLineWriter(sys.stdout)
+        stderr_writer = BatchedLineWriter(sys.stderr)
 
         # Stream output in real-time
-        while True:
-            try:
-                output_batch = get_next_process_output(
-                    rp,
-                    output_iterator,
-                    timeout=1.0,
-                )
-            except TimeoutError:
-                if is_interrupted():
-                    rp.kill()
-                    raise KeyboardInterrupt("Process interrupted") from None
-                if process_is_running(rp):
-                    continue
-                break
-
-            if output_batch is None:
-                break
-
-            for stream_name, line in output_batch:
-                output_stream = sys.stderr if stream_name == "stderr" else sys.stdout
-                print(line, file=output_stream, flush=True)
-
-                # Check if process was interrupted by Ctrl+C
-                if is_interrupted():
-                    rp.kill()
-                    raise KeyboardInterrupt("Process interrupted")
+        try:
+            while True:
+                try:
+                    output_batch = get_next_process_output(
+                        rp,
+                        output_iterator,
+                        timeout=1.0,
+                    )
+                except TimeoutError:
+                    stdout_writer.flush()
+                    stderr_writer.flush()
+                    if is_interrupted():
+                        rp.kill()
+                        raise KeyboardInterrupt("Process interrupted") from None
+                    if process_is_running(rp):
+                        continue
+                    break
+
+                if output_batch is None:
+                    break
+
+                for stream_name, line in output_batch:
+                    write_output_line(stream_name, line, stdout_writer, stderr_writer)
+
+                    # Check if process was interrupted by Ctrl+C
+                    if is_interrupted():
+                        rp.kill()
+                        raise KeyboardInterrupt("Process interrupted")
+        finally:
+            stdout_writer.flush()
+            stderr_writer.flush()
 
         rp.wait()
         rtn = rp.returncode or 0
     except KeyboardInterrupt:
         logger.info("_exec interrupted by user")
-        from codeup.git_utils import interrupt_main
-
         interrupt_main()
         rp.kill()
         raise
@@ -499,9 +647,11 @@ def _exec(cmd: str, bash: bool, die=True) -> int:
 
 
 def check_environment() -> Path:
-    if which("git") is None:
+    git_exe = _which("git")
+    if git_exe is None:
         print("Error: git is not installed.")
         sys.exit(1)
+    set_git_executable(git_exe)
     git_dir = find_git_directory()
     if not git_dir:
         print("Error: .git directory does not exist.")
@@ -509,6 +659,10 @@ def check_environment() -> Path:
     return Path(git_dir)
 
 
+_YES_ANSWERS = frozenset({"y", "yes"})
+_NO_ANSWERS = frozenset({"n", "no"})
+
+
 def get_answer_yes_or_no(question: str, default: bool | str = "y") -> bool:
     """Ask a yes/no question and return the answer."""
     # Check if process has been interrupted
@@ -516,26 +670,22 @@ def get_answer_yes_or_no(question: str, default: bool | str = "y") -> bool:
         logger.info("get_answer_yes_or_no: process already interrupted, raising")
         raise KeyboardInterrupt("Process interrupted")
 
+    if isinstance(default, bool):
+        default_answer = default
+    else:
+        default_answer = default.lower() != "n"
+
     while True:
         try:
             answer = input_with_timeout(question + " [y/n]: ").lower().strip()
-            if "y" in answer:
+            if answer in _YES_ANSWERS:
                 return True
-            if "n" in answer:
+            if answer in _NO_ANSWERS:
                 return False
             if answer == "":
-                if isinstance(default, bool):
-                    return default
-                if isinstance(default, str):
-                    if default.lower() == "y":
-                        return True
-                    elif default.lower() == "n":
-                        return False
-                return True
+                return default_answer
             print("Please answer 'yes' or 'no'.")
         except KeyboardInterrupt:
-            from codeup.git_utils import interrupt_main
-
             interrupt_main()
             raise
         except (EOFError, InputTimeoutError) as e:
@@ -588,8 +738,6 @@ def get_answer_with_choices(
                 return aliases[answer]
             print(f"Please answer with one of: {', '.join(normalized_choices)}.")
         except KeyboardInterrupt:
-            from codeup.git_utils import interrupt_main
-
             interrupt_main()
             raise
         except (EOFError, InputTimeoutError) as e:
@@ -603,18 +751,69 @@ def get_answer_with_choices(
             exit_for_missing_user_input()
 
 
+def _stop_log_listener() -> None:
+    """Stop the background log listener and flush/close its handlers."""
+    global _log_listener, _log_config
+    _log_config = None
+    if _log_listener is None:
+        return
+    _log_listener.stop()
+    for handler in _log_listener.handlers:
+        handler.close()
+    _log_listener = None
+
+
+atexit.register(_stop_log_listener)
+
+
+def flush_logging() -> None:
+    """Write out queued log records before an ``os._exit()``.
+
+    ``os._exit`` skips atexit, so records still queued for the listener
+    thread would otherwise be lost. This stops the listener; call it only
+    on the way out.
+    """
+    _stop_log_listener()
+
+
 def configure_logging(enable_file_logging: bool) -> None:
-    """Configure logging based on whether file logging should be enabled."""
+    """Configure logging based on whether file logging should be enabled.
+
+    Records are handed to a QueueHandler and written by a QueueListener thread,
+    so stderr/file I/O never blocks the thread that emitted the log call.
+    Calling it again with the same settings keeps the running setup.
+    """
+    global _log_listener, _log_config
+    log_file = os.path.abspath("codeup.log") if enable_file_logging else None
+    if (
+        _log_config is not None
+        and _log_config[0] == log_file
+        and _log_config[1] in logging.getLogger().handlers
+    ):
+        return
+    _stop_log_listener()
+
+    formatter = logging.Formatter(
+        "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
     handlers: list[logging.Handler] = [logging.StreamHandler(sys.stderr)]
-    if enable_file_logging:
-        handlers.append(logging.FileHandler("codeup.log"))
+    if log_file is not None:
+        handlers.append(logging.FileHandler(log_file))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue: queue.Queue[logging.LogRecord] = queue.Queue(-1)
+    _log_listener = QueueListener(log_queue, *handlers)
+    _log_listener.start()
 
+    queue_handler = QueueHandler(log_queue)
     logging.basicConfig(
         level=logging.INFO,  # Changed from DEBUG to INFO to reduce spam
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        handlers=handlers,
+        format="%(message)s",  # Final formatting happens in the listener handlers
+        handlers=[queue_handler],
         force=True,  # Override any existing configuration
     )
+    _log_config = (log_file, queue_handler)
 
     # Reduce verbosity of third-party loggers to prevent debug spam
     logging.getLogger("httpx").setLevel(logging.WARNING)
@@ -2,6 +2,7 @@
 
 """Pytest configuration and fixtures for test optimization."""
 
+import subprocess
 import sys
 from unittest.mock import patch
 
@@ -27,13 +28,13 @@ def pytest_exception_interact(node, call, report):
     return None
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_openai_response():
     """Mock OpenAI API response for faster tests."""
     return "feat: add new functionality and improve documentation\n\nImplement new features and enhance project documentation"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_anthropic_response():
     """Mock Anthropic API response for faster tests."""
     return "docs: enhance README with features and installation guide"
@@ -59,3 +60,29 @@ def mock_api_keys():
             "codeup.config.get_anthropic_api_key", return_value="test-anthropic-key"
         ):
             yield
+
+
+@pytest.fixture(scope="session")
+def non_git_dir(tmp_path_factory):
+    """An empty directory outside any git repository, shared for the session."""
+    return tmp_path_factory.mktemp("non_git")
+
+
+@pytest.fixture(scope="session")
+def empty_git_repo(tmp_path_factory):
+    """A freshly initialized git repository with no files, shared for the session."""
+    repo = tmp_path_factory.mktemp("empty_git")
+    subprocess.run(
+        ["git", "init"], cwd=repo, check=True, capture_output=True, text=True
+    )
+    # Same result as two `git config` calls, without spawning git for each
+    with open(repo / ".git" / "config", "a", encoding="utf-8") as config:
+        config.write("[user]\n\temail = test@example.com\n\tname = Test User\n")
+    return repo
+
+
+@pytest.fixture(scope="class")
+def shared_dirs(request, non_git_dir, empty_git_repo):
+    """Expose the session directories to unittest classes as attributes."""
+    request.cls.non_git_dir = str(non_git_dir)
+    request.cls.empty_git_repo = str(empty_git_repo)
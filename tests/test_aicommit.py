@@ -6,6 +6,7 @@ import unittest
 from unittest.mock import MagicMock, patch
 
 from codeup.aicommit import (
+    _DIFF_HASH_CACHE,
     AuthException,
     _clean_clud_output,
     _generate_ai_commit_message,
@@ -18,22 +19,41 @@ from codeup.aicommit import (
 class TestAICommitNonPTY(unittest.TestCase):
     """Test AI commit behavior when terminal is not a PTY."""
 
-    @patch("codeup.aicommit._generate_ai_commit_message")
-    def test_both_ai_providers_fail_non_pty_exits_after_prompt_timeout(
-        self, mock_generate_ai
-    ):
+    @classmethod
+    def setUpClass(cls):
+        # Every test here patches the same three targets; start them once for
+        # the class and reset the mocks between tests.
+        cls._patches = [
+            patch("codeup.aicommit._generate_ai_commit_message"),
+            patch("sys.stdin.isatty"),
+            patch("codeup.aicommit.safe_git_commit"),
+        ]
+        cls.mock_generate_ai, cls.mock_isatty, cls.mock_commit = [
+            p.start() for p in cls._patches
+        ]
+
+    @classmethod
+    def tearDownClass(cls):
+        for p in reversed(cls._patches):
+            p.stop()
+
+    def setUp(self):
+        for mock in (self.mock_generate_ai, self.mock_isatty, self.mock_commit):
+            mock.reset_mock(return_value=True, side_effect=True)
+
+    def test_both_ai_providers_fail_non_pty_exits_after_prompt_timeout(self):
         """
         Test that when both AI providers fail AND terminal is not a PTY,
         prompt failure exits instead of creating a synthetic commit.
         """
-        mock_generate_ai.return_value = AuthException(
+        self.mock_generate_ai.return_value = AuthException(
             "No valid API keys configured", provider=None
         )
+        self.mock_isatty.return_value = False
 
         from codeup.utils import InputTimeoutError
 
         with (
-            patch("sys.stdin.isatty", return_value=False),
             patch(
                 "codeup.utils.input_with_timeout",
                 side_effect=InputTimeoutError("Input timed out"),
@@ -42,7 +62,6 @@ class TestAICommitNonPTY(unittest.TestCase):
                 "codeup.utils.exit_for_missing_user_input",
                 side_effect=SystemExit(1),
             ) as mock_exit,
-            patch("codeup.aicommit.safe_git_commit") as mock_commit,
         ):
             with self.assertRaises(SystemExit) as context:
                 _opencommit_or_prompt_for_commit_message(
@@ -51,62 +70,51 @@ class TestAICommitNonPTY(unittest.TestCase):
 
         self.assertEqual(context.exception.code, 1)
         mock_exit.assert_called_once()
-        mock_commit.assert_not_called()
+        self.mock_commit.assert_not_called()
 
-    @patch("codeup.aicommit._generate_ai_commit_message")
-    @patch("sys.stdin.isatty")
-    def test_ai_success_does_not_check_pty(self, mock_isatty, mock_generate_ai):
+    def test_ai_success_does_not_check_pty(self):
         """
         Test that when AI succeeds, PTY status doesn't matter.
         """
         # Mock AI generation to succeed
-        mock_generate_ai.return_value = "feat: add new feature"
+        self.mock_generate_ai.return_value = "feat: add new feature"
 
         # Mock terminal to not be a PTY
-        mock_isatty.return_value = False
+        self.mock_isatty.return_value = False
 
-        # Mock safe_git_commit to avoid actual git operations
-        with patch("codeup.aicommit.safe_git_commit") as mock_commit:
-            # Should not raise an error
-            _opencommit_or_prompt_for_commit_message(
-                auto_accept=True, no_interactive=False
-            )
+        # Should not raise an error
+        _opencommit_or_prompt_for_commit_message(auto_accept=True, no_interactive=False)
 
-            # Verify commit was called with AI-generated message
-            mock_commit.assert_called_once_with("feat: add new feature")
+        # Verify commit was called with AI-generated message
+        self.mock_commit.assert_called_once_with("feat: add new feature")
 
-    @patch("codeup.aicommit._generate_ai_commit_message")
-    def test_ai_fails_pty_allows_manual_input(self, mock_generate_ai):
+    def test_ai_fails_pty_allows_manual_input(self):
         """
         Test that when AI fails but terminal IS a PTY,
         manual input is requested.
         """
-        mock_generate_ai.return_value = AuthException(
+        self.mock_generate_ai.return_value = AuthException(
             "No valid API keys configured", provider=None
         )
+        self.mock_isatty.return_value = True
 
-        with (
-            patch("sys.stdin.isatty", return_value=True),
-            patch(
-                "codeup.utils.input_with_timeout",
-                return_value="fix: manual commit message",
-            ),
-            patch("codeup.aicommit.safe_git_commit") as mock_commit,
+        with patch(
+            "codeup.utils.input_with_timeout",
+            return_value="fix: manual commit message",
         ):
             _opencommit_or_prompt_for_commit_message(
                 auto_accept=True, no_interactive=False
             )
 
-        mock_commit.assert_called_once_with("fix: manual commit message")
+        self.mock_commit.assert_called_once_with("fix: manual commit message")
 
-    @patch("codeup.aicommit._generate_ai_commit_message")
-    def test_no_interactive_mode_raises_error(self, mock_generate_ai):
+    def test_no_interactive_mode_raises_error(self):
         """
         Test that when AI fails in no_interactive mode,
         RuntimeError is raised regardless of PTY status.
         """
         # Mock AI generation to fail with AuthException
-        mock_generate_ai.return_value = AuthException(
+        self.mock_generate_ai.return_value = AuthException(
             "No valid API keys configured", provider=None
         )
 
@@ -120,14 +128,13 @@ class TestAICommitNonPTY(unittest.TestCase):
         error_message = str(context.exception)
         self.assertIn("codeup -m", error_message.lower())
 
-    @patch("codeup.aicommit._generate_ai_commit_message")
-    def test_unexpected_exception_non_interactive_raises_error(self, mock_generate_ai):
+    def test_unexpected_exception_non_interactive_raises_error(self):
         """
         Test that when an unexpected Exception occurs in non-interactive mode,
         RuntimeError is raised with appropriate message.
         """
         # Mock AI generation to fail with unexpected Exception
-        mock_generate_ai.return_value = ValueError("Unexpected error occurred")
+        self.mock_generate_ai.return_value = ValueError("Unexpected error occurred")
 
         # Should raise RuntimeError with appropriate message
         with self.assertRaises(RuntimeError) as context:
@@ -139,19 +146,16 @@ class TestAICommitNonPTY(unittest.TestCase):
         error_message = str(context.exception)
         self.assertIn("unexpected error", error_message.lower())
 
-    @patch("codeup.aicommit._generate_ai_commit_message")
-    def test_unexpected_exception_non_pty_exits_after_prompt_timeout(
-        self, mock_generate_ai
-    ):
+    def test_unexpected_exception_non_pty_exits_after_prompt_timeout(self):
         """
         Test that unexpected AI errors still follow prompt timeout exit behavior.
         """
-        mock_generate_ai.return_value = ValueError("Unexpected error occurred")
+        self.mock_generate_ai.return_value = ValueError("Unexpected error occurred")
+        self.mock_isatty.return_value = False
 
         from codeup.utils import InputTimeoutError
 
         with (
-            patch("sys.stdin.isatty", return_value=False),
             patch(
                 "codeup.utils.input_with_timeout",
                 side_effect=InputTimeoutError("Input timed out"),
@@ -160,7 +164,6 @@ class TestAICommitNonPTY(unittest.TestCase):
                 "codeup.utils.exit_for_missing_user_input",
                 side_effect=SystemExit(1),
             ) as mock_exit,
-            patch("codeup.aicommit.safe_git_commit") as mock_commit,
         ):
             with self.assertRaises(SystemExit) as context:
                 _opencommit_or_prompt_for_commit_message(
@@ -169,7 +172,56 @@ class TestAICommitNonPTY(unittest.TestCase):
 
         self.assertEqual(context.exception.code, 1)
         mock_exit.assert_called_once()
-        mock_commit.assert_not_called()
+        self.mock_commit.assert_not_called()
+
+
+class TestTrivialDiffShortCircuit(unittest.TestCase):
+    """Test that trivial diffs skip the AI providers."""
+
+    def setUp(self):
+        self.addCleanup(_DIFF_HASH_CACHE.clear)
+
+    def test_whitespace_only_diff_returns_canned_message(self):
+        diff_text = "--- a/file.py\n+++ b/file.py\n@@ -1,2 +1,3 @@\n+\n"
+        with (
+            patch("codeup.aicommit.get_git_diff_cached", return_value=diff_text),
+            patch("codeup.config.get_openai_api_key") as mock_key,
+        ):
+            result = _generate_ai_commit_message()
+
+        self.assertEqual(result, "chore: minor updates")
+        mock_key.assert_not_called()
+
+    def test_file_headers_do_not_count_as_changes(self):
+        diff_text = (
+            "--- a/one.py\n+++ b/one.py\n@@ -1 +1,2 @@\n+\n"
+            "--- a/two.py\n+++ b/two.py\n@@ -1 +1,2 @@\n+\n"
+        )
+        with (
+            patch("codeup.aicommit.get_git_diff_cached", return_value=diff_text),
+            patch("codeup.config.get_openai_api_key") as mock_key,
+        ):
+            result = _generate_ai_commit_message()
+
+        self.assertEqual(result, "chore: minor updates")
+        mock_key.assert_not_called()
+
+    def test_identical_diff_reuses_cached_message(self):
+        diff_text = "--- a/file.py\n+++ b/file.py\n-old = 1\n+new = 2\n"
+        with (
+            patch("codeup.aicommit.get_git_diff_cached", return_value=diff_text),
+            patch("codeup.config.get_openai_api_key", return_value=None),
+            patch(
+                "codeup.aicommit._generate_ai_commit_message_anthropic",
+                return_value="refactor: rename value",
+            ) as mock_anthropic,
+        ):
+            first = _generate_ai_commit_message()
+            second = _generate_ai_commit_message()
+
+        self.assertEqual(first, "refactor: rename value")
+        self.assertEqual(second, "refactor: rename value")
+        mock_anthropic.assert_called_once()
 
 
 class TestStripEmojis(unittest.TestCase):
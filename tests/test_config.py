@@ -2,6 +2,7 @@ import os
 import tempfile
 import unittest
 from pathlib import Path
+from unittest.mock import patch
 
 
 class ConfigTester(unittest.TestCase):
@@ -137,10 +138,6 @@ class ConfigTester(unittest.TestCase):
         src_path = str(Path(self.original_cwd) / "src")
         sys.path.insert(0, src_path)
 
-        # Store original env vars
-        original_openai = os.environ.get("OPENAI_API_KEY")
-        original_anthropic = os.environ.get("ANTHROPIC_API_KEY")
-
         try:
             from codeup.config import get_anthropic_api_key, get_openai_api_key
 
@@ -148,12 +145,16 @@ class ConfigTester(unittest.TestCase):
             test_openai_key = "sk-test-openai-123456789"
             test_anthropic_key = "sk-ant-test-123456789"
 
-            os.environ["OPENAI_API_KEY"] = test_openai_key
-            os.environ["ANTHROPIC_API_KEY"] = test_anthropic_key
-
-            # Should retrieve from environment (but may return existing key if available from other sources)
-            openai_key = get_openai_api_key()
-            anthropic_key = get_anthropic_api_key()
+            with patch.dict(
+                os.environ,
+                {
+                    "OPENAI_API_KEY": test_openai_key,
+                    "ANTHROPIC_API_KEY": test_anthropic_key,
+                },
+            ):
+                # Should retrieve from environment (but may return existing key if available from other sources)
+                openai_key = get_openai_api_key()
+                anthropic_key = get_anthropic_api_key()
 
             # Since config and keyring take priority, just check that we get a valid key
             self.assertIsNotNone(openai_key, "Should retrieve some OpenAI key")
@@ -162,17 +163,6 @@ class ConfigTester(unittest.TestCase):
         except ImportError as e:
             self.skipTest(f"Could not import config module: {e}")
         finally:
-            # Restore original env vars
-            if original_openai is not None:
-                os.environ["OPENAI_API_KEY"] = original_openai
-            elif "OPENAI_API_KEY" in os.environ:
-                del os.environ["OPENAI_API_KEY"]
-
-            if original_anthropic is not None:
-                os.environ["ANTHROPIC_API_KEY"] = original_anthropic
-            elif "ANTHROPIC_API_KEY" in os.environ:
-                del os.environ["ANTHROPIC_API_KEY"]
-
             if src_path in sys.path:
                 sys.path.remove(src_path)
 
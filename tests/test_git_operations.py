@@ -241,6 +241,200 @@ class GitOperationsTester(unittest.TestCase):
             if src_path in sys.path:
                 sys.path.remove(src_path)
 
+    def test_git_add_files_uses_pathspec_file_for_large_lists(self):
+        """Test that many files are staged in one git add via a pathspec file."""
+        import sys
+
+        src_path = str(Path(self.original_cwd) / "src")
+        sys.path.insert(0, src_path)
+
+        try:
+            from codeup import git_utils
+
+            filenames = [f"file_{i}.txt" for i in range(150)]
+            for name in filenames:
+                with open(name, "w") as f:
+                    f.write(name)
+
+            result = git_utils.git_add_files(filenames)
+
+            self.assertEqual(result, 0)
+            staged = subprocess.run(
+                ["git", "diff", "--cached", "--name-only"],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout.split()
+            self.assertEqual(sorted(staged), sorted(filenames))
+
+        except ImportError as e:
+            self.skipTest(f"Could not import required modules: {e}")
+        finally:
+            if src_path in sys.path:
+                sys.path.remove(src_path)
+
+    def test_check_rebase_needed_compares_head_with_remote_ref(self):
+        """Test rebase detection against a remote-tracking ref."""
+        import sys
+
+        src_path = str(Path(self.original_cwd) / "src")
+        sys.path.insert(0, src_path)
+
+        try:
+            from codeup.git_utils import check_rebase_needed
+
+            def git_out(*args):
+                return subprocess.run(
+                    ["git", *args], check=True, capture_output=True, text=True
+                ).stdout.strip()
+
+            base = git_out("rev-parse", "HEAD")
+            git_out("update-ref", "refs/remotes/origin/main", base)
+            self.assertFalse(check_rebase_needed("main"))
+
+            git_out("commit", "--allow-empty", "-m", "Remote commit")
+            git_out("update-ref", "refs/remotes/origin/main", "HEAD")
+            git_out("reset", "--hard", base)
+            self.assertTrue(check_rebase_needed("origin/main"))
+
+        except ImportError as e:
+            self.skipTest(f"Could not import required modules: {e}")
+        finally:
+            if src_path in sys.path:
+                sys.path.remove(src_path)
+
+    def test_branch_names_are_resolved_once_per_repository(self):
+        """Test that repeated branch lookups reuse the first git result."""
+        import sys
+
+        src_path = str(Path(self.original_cwd) / "src")
+        sys.path.insert(0, src_path)
+
+        try:
+            from codeup import git_utils
+
+            current = git_utils.get_current_branch()
+            self.assertTrue(current)
+
+            with patch("codeup.git_utils._run_git_command") as mock_run:
+                self.assertEqual(git_utils.get_current_branch(), current)
+            mock_run.assert_not_called()
+
+        except ImportError as e:
+            self.skipTest(f"Could not import required modules: {e}")
+        finally:
+            if src_path in sys.path:
+                sys.path.remove(src_path)
+
+    def test_branch_cache_is_cleared_after_checkout(self):
+        """Test that a checkout through codeup invalidates the cached branch name."""
+        import sys
+
+        src_path = str(Path(self.original_cwd) / "src")
+        sys.path.insert(0, src_path)
+
+        try:
+            from codeup import git_utils
+
+            original = git_utils.get_current_branch()
+            git_utils._run_git_command(
+                ["git", "checkout", "-b", "feature-x"], quiet=True
+            )
+            self.assertEqual(git_utils.get_current_branch(), "feature-x")
+
+            # A checkout made outside codeup is picked up once the run resets
+            subprocess.run(
+                ["git", "checkout", original], check=True, capture_output=True
+            )
+            self.assertEqual(git_utils.get_current_branch(), "feature-x")
+            git_utils.clear_branch_cache()
+            self.assertEqual(git_utils.get_current_branch(), original)
+
+        except ImportError as e:
+            self.skipTest(f"Could not import required modules: {e}")
+        finally:
+            if src_path in sys.path:
+                sys.path.remove(src_path)
+
+    def test_fetch_head_age_tracks_last_fetch(self):
+        """Test FETCH_HEAD age is None before a fetch and small right after."""
+        import sys
+
+        src_path = str(Path(self.original_cwd) / "src")
+        sys.path.insert(0, src_path)
+
+        try:
+            from codeup.git_utils import get_fetch_head_age
+
+            self.assertIsNone(get_fetch_head_age())
+
+            subprocess.run(
+                ["git", "fetch", self.test_dir], check=True, capture_output=True
+            )
+            age = get_fetch_head_age()
+            self.assertIsNotNone(age)
+            assert age is not None  # Type narrowing for pyright
+            self.assertLess(age, 60.0)
+
+        except ImportError as e:
+            self.skipTest(f"Could not import required modules: {e}")
+        finally:
+            if src_path in sys.path:
+                sys.path.remove(src_path)
+
+    def test_background_fetch_updates_remote_refs(self):
+        """Test that BackgroundFetch runs git fetch and reports its exit code."""
+        import sys
+
+        src_path = str(Path(self.original_cwd) / "src")
+        sys.path.insert(0, src_path)
+
+        try:
+            from codeup.git_utils import BackgroundFetch
+
+            subprocess.run(
+                ["git", "remote", "add", "origin", self.test_dir],
+                check=True,
+                capture_output=True,
+            )
+
+            self.assertEqual(BackgroundFetch().wait(), 0)
+            self.assertTrue(os.path.exists(os.path.join(".git", "FETCH_HEAD")))
+
+        except ImportError as e:
+            self.skipTest(f"Could not import required modules: {e}")
+        finally:
+            if src_path in sys.path:
+                sys.path.remove(src_path)
+
+    def test_background_fetch_never_prompts_for_credentials(self):
+        """Test that the background fetch runs git with prompts disabled."""
+        import sys
+
+        src_path = str(Path(self.original_cwd) / "src")
+        sys.path.insert(0, src_path)
+
+        try:
+            from codeup.git_utils import BackgroundFetch
+
+            with (
+                patch.dict(os.environ, {"GIT_SSH_COMMAND": "ssh -i key"}),
+                patch(
+                    "codeup.git_utils._run_git_command", return_value=(0, "", "")
+                ) as mock_run,
+            ):
+                self.assertEqual(BackgroundFetch().wait(), 0)
+
+            env = mock_run.call_args.kwargs["env"]
+            self.assertEqual(env["GIT_TERMINAL_PROMPT"], "0")
+            self.assertEqual(env["GIT_SSH_COMMAND"], "ssh -i key -o BatchMode=yes")
+
+        except ImportError as e:
+            self.skipTest(f"Could not import required modules: {e}")
+        finally:
+            if src_path in sys.path:
+                sys.path.remove(src_path)
+
 
 if __name__ == "__main__":
     unittest.main()
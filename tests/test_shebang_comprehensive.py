@@ -5,7 +5,9 @@ This test module validates the ShebangProcessor's ability to correctly parse
 implementation to ensure accurate handling of modern shebang styles.
 """
 
+import sys
 import unittest
+import unittest.mock
 
 
 class TestShebangProcessorComprehensive(unittest.TestCase):
@@ -135,6 +137,183 @@ class TestShebangProcessorComprehensive(unittest.TestCase):
                 self.assertEqual(result.program, expected_program)
                 self.assertEqual(result.args, expected_args)
 
+    def test_bash_discovery_is_cached_and_prefers_path(self):
+        """Bash found on PATH is used without probing, and looked up only once."""
+        from unittest.mock import patch
+
+        from codeup import shebang_processor
+
+        shebang_processor._cached_bash_exe.cache_clear()
+        self.addCleanup(shebang_processor._cached_bash_exe.cache_clear)
+        with (
+            patch("shutil.which", return_value="/usr/bin/bash") as mock_which,
+            patch("codeup.shebang_processor.RunningProcess") as mock_rp,
+        ):
+            self.assertEqual(shebang_processor._cached_bash_exe(), "/usr/bin/bash")
+            self.assertEqual(shebang_processor._cached_bash_exe(), "/usr/bin/bash")
+        mock_which.assert_called_once_with("bash")
+        mock_rp.assert_not_called()
+
+    def test_bash_discovery_falls_back_to_known_paths_without_spawning(self):
+        """Without bash on PATH, known install locations are only stat'ed."""
+        from unittest.mock import patch
+
+        from codeup import shebang_processor
+
+        git_bash = r"C:\Program Files\Git\bin\bash.exe"
+        shebang_processor._cached_bash_exe.cache_clear()
+        self.addCleanup(shebang_processor._cached_bash_exe.cache_clear)
+        with (
+            patch("shutil.which", return_value=None),
+            patch("os.path.isfile", side_effect=lambda p: p == git_bash),
+            patch("codeup.shebang_processor.RunningProcess") as mock_rp,
+        ):
+            self.assertEqual(shebang_processor._cached_bash_exe(), git_bash)
+        mock_rp.assert_not_called()
+
+    def test_plain_and_quoted_shebangs_share_tokenization(self):
+        """The whitespace fast path agrees with shlex and results are cached."""
+        import shlex
+
+        from codeup import shebang_processor
+
+        line = "#!/usr/bin/env -S uv run --python 3.12"
+        quoted_line = '#!/bin/sh -c "echo hi"'
+        shebang_processor._parse_shebang_line.cache_clear()
+        with unittest.mock.patch.object(
+            shebang_processor.shlex, "split", wraps=shlex.split
+        ) as mock_split:
+            first = self.processor.lex_parse_shebang(line)
+            second = self.processor.lex_parse_shebang(line)
+            quoted = self.processor.lex_parse_shebang(quoted_line)
+        self.assertEqual(first, second)
+        assert first is not None  # Type checker hint
+        self.assertEqual(first.program, "uv")
+        self.assertEqual(first.args, ["run", "--python", "3.12"])
+        # Each caller gets its own args list; changing one leaves the cache intact
+        first.args.append("--extra")
+        third = self.processor.lex_parse_shebang(line)
+        assert third is not None  # Type checker hint
+        self.assertEqual(third.args, ["run", "--python", "3.12"])
+        assert quoted is not None  # Type checker hint
+        self.assertEqual(quoted.args, ["-c", "echo hi"])
+        mock_split.assert_called_once_with('/bin/sh -c "echo hi"')
+
+    def test_parse_shebang_reads_first_line_of_script(self):
+        """parse_shebang reads only the script's first line, CRLF or not."""
+        import os
+        import tempfile
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            script = os.path.join(tmpdir, "lint")
+            with open(script, "wb") as f:
+                f.write(b"#!/usr/bin/env -S uv run --python 3.12\r\n")
+                f.write(b"echo " + b"x" * 1024 + b"\n")
+            result = self.processor.parse_shebang(script)
+            self.assertIsNotNone(result)
+            assert result is not None  # Type checker hint
+            self.assertEqual(result.program, "uv")
+            self.assertEqual(result.args, ["run", "--python", "3.12"])
+
+            plain = os.path.join(tmpdir, "plain")
+            with open(plain, "wb") as f:
+                f.write(b"echo hello\n")
+            self.assertIsNone(self.processor.parse_shebang(plain))
+            self.assertIsNone(
+                self.processor.parse_shebang(os.path.join(tmpdir, "missing"))
+            )
+
+    def test_parse_shebang_survives_long_non_ascii_first_line(self):
+        """A first line cut mid-character by the bounded read still parses."""
+        import os
+        import tempfile
+
+        from codeup.shebang_processor import _SHEBANG_READ_SIZE
+
+        prefix = b"#!/usr/bin/env -S python3 -X "
+        first_line = prefix + "\u00e9".encode() * _SHEBANG_READ_SIZE
+        # Make sure the read boundary really falls inside a two-byte character
+        self.assertEqual((_SHEBANG_READ_SIZE - len(prefix)) % 2, 1)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            script = os.path.join(tmpdir, "lint")
+            with open(script, "wb") as f:
+                f.write(first_line + b"\necho hi\n")
+            result = self.processor.parse_shebang(script)
+
+        self.assertIsNotNone(result)
+        assert result is not None  # Type checker hint
+        self.assertEqual(result.program, "python3")
+        self.assertEqual(result.args[0], "-X")
+        self.assertTrue(result.args[1].startswith("\u00e9"))
+
+    def test_parse_shebang_rereads_only_when_script_changes(self):
+        """Repeated parses of an unchanged script do not reopen the file."""
+        import os
+        import tempfile
+        from unittest.mock import patch
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            script = os.path.join(tmpdir, "test")
+            with open(script, "w", encoding="utf-8") as f:
+                f.write("#!/bin/bash\necho hi\n")
+            with patch("codeup.shebang_processor.os.open", wraps=os.open) as mock_open:
+                first = self.processor.parse_shebang(script)
+                second = self.processor.parse_shebang(script)
+                self.assertEqual(mock_open.call_count, 1)
+
+                with open(script, "w", encoding="utf-8") as f:
+                    f.write("#!/usr/bin/env python3\n")
+                st = os.stat(script)
+                os.utime(script, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+                third = self.processor.parse_shebang(script)
+                self.assertEqual(mock_open.call_count, 2)
+
+        assert first is not None and second is not None and third is not None
+        self.assertEqual(first.program, "bash")
+        self.assertEqual(second.program, "bash")
+        self.assertEqual(third.program, "python3")
+
+    @unittest.skipIf(sys.platform == "win32", "POSIX execute permission check")
+    def test_non_executable_script_without_shebang_is_rejected(self):
+        """A script with no shebang and no exec bit fails before spawning."""
+        import os
+        import tempfile
+        from unittest.mock import patch
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            script = os.path.join(tmpdir, "lint")
+            with open(script, "w", encoding="utf-8") as f:
+                f.write("echo hi\n")
+            os.chmod(script, 0o644)
+
+            with self.assertRaises(PermissionError):
+                self.processor.get_execution_command(script)
+            with patch("codeup.shebang_processor.RunningProcess") as mock_rp:
+                self.assertEqual(self.processor.execute_script(script), 1)
+            mock_rp.assert_not_called()
+
+            os.chmod(script, 0o755)
+            self.assertEqual(self.processor.get_execution_command(script), [script])
+
+    @unittest.skipIf(sys.platform == "win32", "POSIX shell script")
+    def test_execute_script_accepts_str_cwd(self):
+        """execute_script runs the script in a cwd given as a plain string."""
+        import os
+        import tempfile
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            script = os.path.join(tmpdir, "lint")
+            with open(script, "w", encoding="utf-8") as f:
+                f.write("#!/bin/sh\npwd > cwd.txt\n")
+            os.chmod(script, 0o755)
+
+            self.assertEqual(self.processor.execute_script(script, cwd=tmpdir), 0)
+            with open(os.path.join(tmpdir, "cwd.txt"), encoding="utf-8") as f:
+                self.assertEqual(
+                    os.path.realpath(f.read().strip()), os.path.realpath(tmpdir)
+                )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -190,6 +190,50 @@ class StreamingPollingTests(unittest.TestCase):
 
         self.assertEqual(code, 0)
 
+    def test_exec_bash_path_runs_bash_directly_without_shell(self):
+        from codeup import utils
+
+        _ScriptedRunningProcess.script = [_FakeEndOfStream()]
+        calls = []
+
+        class _RecordingRunningProcess(_ScriptedRunningProcess):
+            def __init__(self, *args, **kwargs):
+                calls.append(kwargs)
+                super().__init__(*args, **kwargs)
+
+        with (
+            patch("codeup.utils.RunningProcess", _RecordingRunningProcess),
+            patch("codeup.utils.is_interrupted", return_value=False),
+            patch("codeup.utils._IS_WINDOWS", True),
+            patch("codeup.utils._find_bash_on_windows", return_value="bash.exe"),
+        ):
+            code = utils._exec("./lint && ./test", bash=True, die=False)
+
+        self.assertEqual(code, 0)
+        self.assertEqual(len(calls), 1)
+        self.assertFalse(calls[0]["shell"])
+        self.assertEqual(calls[0]["command"], ["bash.exe", "-c", "./lint && ./test"])
+
+    def test_git_command_uses_resolved_git_executable(self):
+        from codeup import git_utils
+
+        _ScriptedRunningProcess.script = [_FakeEndOfStream()]
+        calls = []
+
+        class _RecordingRunningProcess(_ScriptedRunningProcess):
+            def __init__(self, *args, **kwargs):
+                calls.append(kwargs)
+                super().__init__(*args, **kwargs)
+
+        with (
+            patch("codeup.git_utils.RunningProcess", _RecordingRunningProcess),
+            patch("codeup.git_utils._git_executable", "/opt/git/bin/git"),
+            patch("codeup.utils.is_interrupted", return_value=False),
+        ):
+            git_utils._run_git_command(["git", "status"], quiet=True)
+
+        self.assertEqual(calls[0]["command"], ["/opt/git/bin/git", "status"])
+
     def test_run_command_streaming_recognizes_module_end_of_stream_without_process_attr(
         self,
     ):
@@ -277,6 +321,34 @@ class StreamingPollingTests(unittest.TestCase):
         self.assertEqual(stdout, "hello")
         self.assertEqual(stderr, "problem")
 
+    def test_next_process_output_drains_already_buffered_lines(self):
+        from codeup.utils import get_next_process_output, get_process_output_iterator
+
+        class _DrainingProcess(_StreamIterRunningProcess):
+            script = [
+                _ProcessStreamEvent(stdout="first"),
+                _ProcessStreamEvent(
+                    stdout=_FakeEndOfStream(), stderr=_FakeEndOfStream()
+                ),
+            ]
+
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                self.ready = [("stdout", "second"), ("stderr", "third")]
+
+            def drain_combined(self):
+                ready, self.ready = self.ready, []
+                return ready
+
+        process = _DrainingProcess()
+        output_iterator = get_process_output_iterator(process, timeout=1)
+
+        self.assertEqual(
+            get_next_process_output(process, output_iterator, timeout=1),
+            [("stdout", "first"), ("stdout", "second"), ("stderr", "third")],
+        )
+        self.assertIsNone(get_next_process_output(process, output_iterator, timeout=1))
+
     def test_command_runner_captures_explicit_stdout_and_stderr_streams(self):
         from codeup import command_runner
 
@@ -69,30 +69,35 @@ class UtilitiesTester(unittest.TestCase):
         sys.path.insert(0, src_path)
 
         try:
-            from codeup.main import _to_exec_str
+            from codeup.main import _to_exec_args
 
             # Test bash command on Windows
             if sys.platform == "win32":
                 cmd = "echo hello"
-                result = _to_exec_str(cmd, bash=True)
+                result = _to_exec_args(cmd, bash=True)
                 # Should use the full path to Git Bash and wrap the command
-                self.assertTrue(
-                    result.endswith(' -c "echo hello"'),
+                self.assertEqual(
+                    result[1:],
+                    ["-c", "echo hello"],
                     "Should wrap bash commands on Windows with proper executable",
                 )
                 self.assertTrue(
-                    "bash.exe" in result,
+                    result[0].endswith("bash.exe"),
                     "Should use bash.exe on Windows",
                 )
 
-                result = _to_exec_str(cmd, bash=False)
-                self.assertEqual(result, cmd, "Should not wrap non-bash commands")
+                result = _to_exec_args(cmd, bash=False)
+                self.assertEqual(
+                    result, ["echo", "hello"], "Should not wrap non-bash commands"
+                )
             else:
-                # On non-Windows platforms, should return command as-is
-                cmd = "echo hello"
-                result = _to_exec_str(cmd, bash=True)
+                # On non-Windows platforms, should split the command as-is
+                cmd = "echo 'hello world'"
+                result = _to_exec_args(cmd, bash=True)
                 self.assertEqual(
-                    result, cmd, "Should return command as-is on non-Windows"
+                    result,
+                    ["echo", "hello world"],
+                    "Should split command as-is on non-Windows",
                 )
 
         except ImportError as e:
@@ -115,6 +120,14 @@ class UtilitiesTester(unittest.TestCase):
                     result = get_answer_yes_or_no("Test question?", default="y")
                     self.assertTrue(result)
 
+                with patch(
+                    "codeup.utils.input_with_timeout",
+                    side_effect=["nope", "ny", " No "],
+                ) as mock_input:
+                    result = get_answer_yes_or_no("Test question?", default="y")
+                    self.assertFalse(result)
+                    self.assertEqual(mock_input.call_count, 3)
+
                 with patch(
                     "codeup.utils.input_with_timeout",
                     side_effect=InputTimeoutError("Input timed out"),
@@ -129,6 +142,70 @@ class UtilitiesTester(unittest.TestCase):
             if src_path in sys.path:
                 sys.path.remove(src_path)
 
+    @unittest.skipIf(sys.platform == "win32", "selectors need sockets on Windows")
+    def test_input_with_timeout_reads_stdin_without_thread(self):
+        """Test that terminal prompts wait on stdin directly instead of a reader thread."""
+        src_path = str(Path(self.original_cwd) / "src")
+        sys.path.insert(0, src_path)
+
+        try:
+            import io
+            import pty
+
+            from codeup.utils import InputTimeoutError, input_with_timeout
+
+            master_fd, slave_fd = pty.openpty()
+            self.addCleanup(os.close, master_fd)
+            self.addCleanup(os.close, slave_fd)
+            os.write(master_fd, b"yes\nno\n")
+            stdin = io.TextIOWrapper(io.FileIO(slave_fd, closefd=False))
+
+            with (
+                patch("sys.stdin", stdin),
+                patch("sys.stdout", io.StringIO()) as stdout,
+                patch("threading.Thread", side_effect=AssertionError("thread used")),
+            ):
+                self.assertEqual(input_with_timeout("Q1: ", timeout_seconds=5), "yes")
+                self.assertEqual(input_with_timeout("Q2: ", timeout_seconds=5), "no")
+                with self.assertRaises(InputTimeoutError):
+                    input_with_timeout("Q3: ", timeout_seconds=0.1)
+            self.assertEqual(stdout.getvalue(), "Q1: Q2: Q3: ")
+
+        except ImportError as e:
+            self.skipTest(f"Could not import utils module: {e}")
+        finally:
+            if src_path in sys.path:
+                sys.path.remove(src_path)
+
+    def test_input_with_timeout_keeps_buffered_pipe_input(self):
+        """Test that piped stdin lines buffered by an earlier read are not skipped."""
+        src_path = str(Path(self.original_cwd) / "src")
+        sys.path.insert(0, src_path)
+
+        try:
+            import io
+
+            from codeup.utils import input_with_timeout
+
+            read_fd, write_fd = os.pipe()
+            self.addCleanup(os.close, read_fd)
+            self.addCleanup(os.close, write_fd)
+            os.write(write_fd, b"earlier\nyes\nno\n")
+            stdin = io.TextIOWrapper(io.FileIO(read_fd, closefd=False))
+            # An earlier read pulls the whole chunk into sys.stdin's buffer,
+            # leaving nothing in the pipe for select() or os.read() to see.
+            self.assertEqual(stdin.readline(), "earlier\n")
+
+            with patch("sys.stdin", stdin), patch("sys.stdout", io.StringIO()):
+                self.assertEqual(input_with_timeout("Q1: ", timeout_seconds=5), "yes")
+                self.assertEqual(input_with_timeout("Q2: ", timeout_seconds=5), "no")
+
+        except ImportError as e:
+            self.skipTest(f"Could not import utils module: {e}")
+        finally:
+            if src_path in sys.path:
+                sys.path.remove(src_path)
+
     def test_choice_question_handling(self):
         """Test explicit multi-choice question handling."""
         src_path = str(Path(self.original_cwd) / "src")
@@ -224,8 +301,14 @@ class UtilitiesTester(unittest.TestCase):
                     logger = logging.getLogger(__name__)
                     logger.info("Test log message")
 
+                    # Same settings again keep the running configuration
+                    root_handlers = list(logging.getLogger().handlers)
+                    configure_logging(enable_file_logging=True)
+                    self.assertEqual(logging.getLogger().handlers, root_handlers)
+
                     # Test without file logging
                     configure_logging(enable_file_logging=False)
+                    self.assertNotEqual(logging.getLogger().handlers, root_handlers)
                     logger.info("Another test log message")
 
                 finally:
@@ -237,6 +320,37 @@ class UtilitiesTester(unittest.TestCase):
             if src_path in sys.path:
                 sys.path.remove(src_path)
 
+    def test_flush_logging_writes_queued_records(self):
+        """Test flush_logging gets queued records into the log file before exit."""
+        src_path = str(Path(self.original_cwd) / "src")
+        sys.path.insert(0, src_path)
+
+        try:
+            import logging
+
+            from codeup.utils import configure_logging, flush_logging
+
+            with tempfile.TemporaryDirectory() as temp_dir:
+                original_cwd = os.getcwd()
+                os.chdir(temp_dir)
+
+                try:
+                    configure_logging(enable_file_logging=True)
+                    logging.getLogger(__name__).error("watchdog timed out")
+                    flush_logging()
+
+                    with open("codeup.log", encoding="utf-8") as f:
+                        self.assertIn("watchdog timed out", f.read())
+                finally:
+                    configure_logging(enable_file_logging=False)
+                    os.chdir(original_cwd)
+
+        except ImportError as e:
+            self.skipTest(f"Could not import utils module: {e}")
+        finally:
+            if src_path in sys.path:
+                sys.path.remove(src_path)
+
     def test_timeout_monitoring_only_active_for_lint_and_test_phases(self):
         """Test stale watchdog only applies during lint/test subprocess phases."""
         src_path = str(Path(self.original_cwd) / "src")
@@ -374,6 +488,155 @@ class UtilitiesTester(unittest.TestCase):
             if src_path in sys.path:
                 sys.path.remove(src_path)
 
+    def test_batched_line_writer_flushes_on_interval(self):
+        """Test that streamed lines are flushed in batches, not per line."""
+        src_path = str(Path(self.original_cwd) / "src")
+        sys.path.insert(0, src_path)
+
+        try:
+            from unittest.mock import MagicMock
+
+            from codeup.utils import BatchedLineWriter
+
+            stream = MagicMock()
+            with patch("codeup.utils.time.monotonic", return_value=100.0):
+                writer = BatchedLineWriter(stream, interval=0.05)
+                writer.write_line("one")
+                writer.write_line("two")
+            stream.flush.assert_not_called()
+
+            with patch("codeup.utils.time.monotonic", return_value=100.1):
+                writer.write_line("three")
+            stream.flush.assert_called_once()
+
+            writer.flush()  # Nothing pending, so no extra flush
+            stream.flush.assert_called_once()
+
+        except ImportError as e:
+            self.skipTest(f"Could not import main module: {e}")
+        finally:
+            if src_path in sys.path:
+                sys.path.remove(src_path)
+
+    def test_write_output_line_keeps_streams_in_order(self):
+        """Test that interleaved stdout/stderr lines reach the terminal in order."""
+        src_path = str(Path(self.original_cwd) / "src")
+        sys.path.insert(0, src_path)
+
+        try:
+            from codeup.utils import BatchedLineWriter, write_output_line
+
+            terminal: list[str] = []
+
+            class BufferedStream:
+                """Holds writes until flushed, like a block-buffered pipe."""
+
+                def __init__(self) -> None:
+                    self.buffer: list[str] = []
+
+                def write(self, text: str) -> None:
+                    self.buffer.append(text)
+
+                def flush(self) -> None:
+                    terminal.extend(self.buffer)
+                    self.buffer.clear()
+
+            lines = [
+                ("stdout", "collecting"),
+                ("stdout", "test_a PASSED"),
+                ("stderr", "DeprecationWarning"),
+                ("stdout", "test_b PASSED"),
+                ("stderr", "Traceback"),
+                ("stderr", "ValueError"),
+                ("stdout", "1 failed"),
+            ]
+            with patch("codeup.utils.time.monotonic", return_value=100.0):
+                stdout_writer = BatchedLineWriter(BufferedStream(), interval=0.05)
+                stderr_writer = BatchedLineWriter(BufferedStream(), interval=0.05)
+                for stream_name, line in lines:
+                    write_output_line(stream_name, line, stdout_writer, stderr_writer)
+                stdout_writer.flush()
+                stderr_writer.flush()
+
+            self.assertEqual(terminal, [f"{line}\n" for _, line in lines])
+
+        except ImportError as e:
+            self.skipTest(f"Could not import main module: {e}")
+        finally:
+            if src_path in sys.path:
+                sys.path.remove(src_path)
+
+    def test_timestamp_formatter_uses_monotonic_centiseconds(self):
+        """Test that elapsed time is formatted from monotonic nanoseconds."""
+        src_path = str(Path(self.original_cwd) / "src")
+        sys.path.insert(0, src_path)
+
+        try:
+            from codeup.timestamp_formatter import TimestampOutputFormatter
+
+            formatter = TimestampOutputFormatter()
+            with patch(
+                "codeup.timestamp_formatter.time.monotonic_ns",
+                side_effect=[1_000_000_000, 1_000_000_000, 13_456_789_012],
+            ):
+                formatter.begin()
+                self.assertEqual(formatter.transform("start"), "0.00 start")
+                self.assertEqual(formatter.transform("later"), "12.45 later")
+
+        except ImportError as e:
+            self.skipTest(f"Could not import timestamp_formatter module: {e}")
+        finally:
+            if src_path in sys.path:
+                sys.path.remove(src_path)
+
+    def test_is_suspicious_file(self):
+        """Test suspicious extension and temp-name detection."""
+        src_path = str(Path(self.original_cwd) / "src")
+        sys.path.insert(0, src_path)
+
+        try:
+            from codeup.utils import is_suspicious_file
+
+            for filename in ["notes.txt", "BUILD.LOG", "lib.so", ".cache", "mytmp.py"]:
+                with self.subTest(filename=filename):
+                    self.assertTrue(is_suspicious_file(filename))
+            for filename in ["main.py", "README", "dist.txt/setup.py", "a.tar.gz"]:
+                with self.subTest(filename=filename):
+                    self.assertFalse(is_suspicious_file(filename))
+
+        except ImportError as e:
+            self.skipTest(f"Could not import utils module: {e}")
+        finally:
+            if src_path in sys.path:
+                sys.path.remove(src_path)
+
+    def test_find_bash_on_windows_is_cached(self):
+        """Test that Windows bash discovery only probes the filesystem once."""
+        src_path = str(Path(self.original_cwd) / "src")
+        sys.path.insert(0, src_path)
+
+        try:
+            from codeup.utils import _find_bash_on_windows
+
+            _find_bash_on_windows.cache_clear()
+            self.addCleanup(_find_bash_on_windows.cache_clear)
+            with (
+                patch("codeup.utils.os.path.isdir", return_value=True) as mock_isdir,
+                patch("codeup.utils.os.path.isfile", return_value=True) as mock_isfile,
+            ):
+                first = _find_bash_on_windows()
+                second = _find_bash_on_windows()
+            self.assertEqual(first, r"C:\Program Files\Git\bin\bash.exe")
+            self.assertEqual(second, first)
+            mock_isdir.assert_called_once()
+            mock_isfile.assert_called_once()
+
+        except ImportError as e:
+            self.skipTest(f"Could not import utils module: {e}")
+        finally:
+            if src_path in sys.path:
+                sys.path.remove(src_path)
+
     def test_encoding_handling(self):
         """Test UTF-8 encoding handling on Windows."""
         src_path = str(Path(self.original_cwd) / "src")